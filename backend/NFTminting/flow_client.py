@@ -0,0 +1,413 @@
+import asyncio
+import base64
+import json
+import os
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import httpx
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+from response_cache import make_key
+from NFTminting.mint import (
+    FLOW_PROJECT_DIR, MINT_BATCH_TX, NETWORK, batch_mint_arguments, cadence_value,
+    summarize_events,
+)
+
+# =========================
+# Config (env-first)
+# =========================
+ACCESS_NODES = {
+    "mainnet": "https://rest-mainnet.onflow.org",
+    "testnet": "https://rest-testnet.onflow.org",
+    "emulator": "http://127.0.0.1:8888",
+}
+FLOW_ACCESS_API = os.getenv("FLOW_ACCESS_API") or ACCESS_NODES.get(NETWORK, ACCESS_NODES["testnet"])
+FLOW_JSON = os.getenv("FLOW_JSON") or os.path.join(FLOW_PROJECT_DIR, "flow.json")
+FLOW_GAS_LIMIT = int(os.getenv("FLOW_GAS_LIMIT") or 9999)
+FLOW_POLL_INTERVAL = float(os.getenv("FLOW_POLL_INTERVAL") or 0.5)
+FLOW_SEAL_TIMEOUT = float(os.getenv("FLOW_SEAL_TIMEOUT") or 120)
+FLOW_MAX_CONNECTIONS = int(os.getenv("FLOW_MAX_CONNECTIONS") or 10)
+# IDs per bulk metadata script call (bounded by the script computation limit)
+FLOW_METADATA_CHUNK = int(os.getenv("FLOW_METADATA_CHUNK") or 250)
+# A reference block stays valid for ~600 blocks (~10 minutes); refresh well before that
+FLOW_REFERENCE_BLOCK_TTL = float(os.getenv("FLOW_REFERENCE_BLOCK_TTL") or 60)
+
+SCRIPTS_DIR = os.path.join(FLOW_PROJECT_DIR, "NFTminting", "cadence", "scripts")
+TRANSACTION_DOMAIN_TAG = b"FLOW-V0.0-transaction".ljust(32, b"\0")
+
+CURVES = {"ECDSA_P256": ec.SECP256R1, "ECDSA_secp256k1": ec.SECP256K1}
+HASHES = {"SHA3_256": hashes.SHA3_256, "SHA2_256": hashes.SHA256}
+
+
+class FlowAPIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Flow access API error {status}: {message}")
+        self.status = status
+
+
+# =========================
+# Encoding
+# =========================
+def rlp_encode(item) -> bytes:
+    """Minimal RLP (bytes, non-negative ints and lists), as used by Flow transaction signing"""
+    if isinstance(item, list):
+        payload = b"".join(rlp_encode(i) for i in item)
+        return _rlp_length(len(payload), 0xC0) + payload
+    if isinstance(item, int):
+        item = item.to_bytes((item.bit_length() + 7) // 8, "big") if item else b""
+    if len(item) == 1 and item[0] < 0x80:
+        return item
+    return _rlp_length(len(item), 0x80) + item
+
+
+def _rlp_length(length: int, offset: int) -> bytes:
+    if length < 56:
+        return bytes([offset + length])
+    encoded = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([offset + 55 + len(encoded)]) + encoded
+
+
+def address_bytes(address: str) -> bytes:
+    return bytes.fromhex(address.removeprefix("0x").rjust(16, "0"))
+
+
+def b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def encode_argument(argument: Dict) -> bytes:
+    return json.dumps(argument, separators=(",", ":")).encode("utf-8")
+
+
+def decode_payload(payload: str) -> Any:
+    return json.loads(base64.b64decode(payload))
+
+
+@lru_cache(maxsize=32)
+def load_cadence(path: str) -> bytes:
+    """Cadence source relative to the Flow project directory (read once)"""
+    with open(os.path.join(FLOW_PROJECT_DIR, path), "rb") as f:
+        return f.read()
+
+
+# =========================
+# Signing
+# =========================
+class FlowSigner:
+    """One account key able to sign transaction envelopes"""
+
+    def __init__(self, address: str, private_key_hex: str, key_index: int = 0,
+                 signature_algorithm: str = "ECDSA_P256", hash_algorithm: str = "SHA3_256"):
+        self.address = address.removeprefix("0x")
+        self.key_index = key_index
+        self.hash_algorithm = HASHES[hash_algorithm]
+        self._key = ec.derive_private_key(
+            int(private_key_hex.removeprefix("0x"), 16), CURVES[signature_algorithm]()
+        )
+
+    @classmethod
+    def from_flow_json(cls, name: str, path: str = FLOW_JSON) -> "FlowSigner":
+        """Signer for an account entry in flow.json (hex keys, env or file references)"""
+        with open(path, "r", encoding="utf-8") as f:
+            account = json.load(f)["accounts"][name]
+        key = account["key"]
+        if isinstance(key, str):
+            key = {"type": "hex", "privateKey": key}
+        if key.get("type") == "file":
+            location = os.path.join(os.path.dirname(path), key["location"])
+            with open(location, "r", encoding="utf-8") as f:
+                private_key = f.read().strip()
+        else:
+            private_key = key["privateKey"]
+        if private_key.startswith("$"):
+            private_key = os.environ[private_key.lstrip("${").rstrip("}")]
+        return cls(
+            account["address"], private_key, int(key.get("index", 0)),
+            key.get("signatureAlgorithm", "ECDSA_P256"), key.get("hashAlgorithm", "SHA3_256"),
+        )
+
+    def sign(self, message: bytes) -> bytes:
+        der = self._key.sign(message, ec.ECDSA(self.hash_algorithm()))
+        r, s = decode_dss_signature(der)
+        size = (self._key.curve.key_size + 7) // 8
+        return r.to_bytes(size, "big") + s.to_bytes(size, "big")
+
+
+# =========================
+# Client
+# =========================
+class FlowAccessClient:
+    """
+    Long-lived client for the Flow REST access API. Builds, signs, submits and
+    polls transactions and runs scripts over one pooled HTTP client, instead
+    of starting a `flow` CLI process (and re-reading flow.json) for each mint.
+
+    Proposal-key sequence numbers are tracked in process, so a signer can have
+    several transactions in flight. Only the build-and-submit step is
+    serialized per key; waiting for the seal is not.
+    """
+
+    def __init__(self, base_url: str = FLOW_ACCESS_API, timeout: float = 30,
+                 max_connections: int = FLOW_MAX_CONNECTIONS, cache=None):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+        self._signers: Dict[str, FlowSigner] = {}
+        self._sequence: Dict[tuple, int] = {}
+        self._key_locks: Dict[tuple, asyncio.Lock] = {}
+        self._reference_block: Optional[tuple] = None
+        self.submitted = 0
+        self.sealed = 0
+        self.failed = 0
+        self.scripts = 0
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def signer(self, name: str) -> FlowSigner:
+        """flow.json account by name, loaded once"""
+        if name not in self._signers:
+            self._signers[name] = FlowSigner.from_flow_json(name)
+        return self._signers[name]
+
+    # ---------- HTTP ----------
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        response = await self.client.request(method, path, **kwargs)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise FlowAPIError(response.status_code, message)
+        return response.json()
+
+    async def reference_block_id(self) -> str:
+        now = time.monotonic()
+        if self._reference_block is None or now - self._reference_block[1] > FLOW_REFERENCE_BLOCK_TTL:
+            blocks = await self._request("GET", "/v1/blocks", params={"height": "sealed"})
+            self._reference_block = (blocks[0]["header"]["id"], now)
+        return self._reference_block[0]
+
+    async def block_height(self, block_id: str) -> Optional[int]:
+        blocks = await self._request("GET", f"/v1/blocks/{block_id}")
+        return int(blocks[0]["header"]["height"]) if blocks else None
+
+    async def sequence_number(self, address: str, key_index: int) -> int:
+        account = await self._request("GET", f"/v1/accounts/{address}", params={"expand": "keys"})
+        for key in account.get("keys", []):
+            if int(key["index"]) == key_index:
+                return int(key["sequence_number"])
+        raise FlowAPIError(404, f"Key {key_index} not found on account {address}")
+
+    # ---------- transactions ----------
+    def _envelope_message(self, script: bytes, arguments: List[bytes], reference_block_id: str,
+                          gas_limit: int, signer: FlowSigner, sequence_number: int) -> bytes:
+        address = address_bytes(signer.address)
+        payload = [
+            script,
+            arguments,
+            bytes.fromhex(reference_block_id),
+            gas_limit,
+            address,
+            signer.key_index,
+            sequence_number,
+            address,   # payer
+            [address], # authorizers
+        ]
+        # Proposer, payer and sole authorizer are the same account, so only
+        # an envelope signature is needed (no payload signatures)
+        return TRANSACTION_DOMAIN_TAG + rlp_encode([payload, []])
+
+    async def send_transaction(self, script: bytes, arguments: List[Dict], signer: FlowSigner,
+                               gas_limit: int = FLOW_GAS_LIMIT) -> str:
+        """Sign with `signer` as proposer, payer and authorizer; returns the transaction ID"""
+        encoded_args = [encode_argument(a) for a in arguments]
+        key = (signer.address, signer.key_index)
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            reference_block_id = await self.reference_block_id()
+            if key not in self._sequence:
+                self._sequence[key] = await self.sequence_number(signer.address, signer.key_index)
+            sequence_number = self._sequence[key]
+            message = self._envelope_message(
+                script, encoded_args, reference_block_id, gas_limit, signer, sequence_number
+            )
+            body = {
+                "script": b64(script),
+                "arguments": [b64(a) for a in encoded_args],
+                "reference_block_id": reference_block_id,
+                "gas_limit": str(gas_limit),
+                "payer": signer.address,
+                "proposal_key": {
+                    "address": signer.address,
+                    "key_index": str(signer.key_index),
+                    "sequence_number": str(sequence_number),
+                },
+                "authorizers": [signer.address],
+                "payload_signatures": [],
+                "envelope_signatures": [{
+                    "address": signer.address,
+                    "key_index": str(signer.key_index),
+                    "signature": b64(signer.sign(message)),
+                }],
+            }
+            try:
+                submitted = await self._request("POST", "/v1/transactions", json=body)
+            except Exception:
+                # Our view of the sequence number may be stale; re-read it next time
+                self._sequence.pop(key, None)
+                raise
+            self._sequence[key] = sequence_number + 1
+        self.submitted += 1
+        return submitted["id"]
+
+    async def wait_for_seal(self, tx_id: str, timeout: float = FLOW_SEAL_TIMEOUT) -> Dict:
+        deadline = time.monotonic() + timeout
+        while True:
+            result = await self._request("GET", f"/v1/transaction_results/{tx_id}")
+            if result["status"] in ("Sealed", "Expired") or result.get("error_message"):
+                return result
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Transaction {tx_id} not sealed after {timeout:.0f}s")
+            await asyncio.sleep(FLOW_POLL_INTERVAL)
+
+    async def execute(self, script: bytes, arguments: List[Dict], signer: FlowSigner) -> Dict:
+        """
+        Send, wait for the seal and return a record shaped like
+        mint.parse_flow_result() (plus returncode/latency_ms).
+        """
+        started = time.perf_counter()
+        tx_id = await self.send_transaction(script, arguments, signer)
+        result = await self.wait_for_seal(tx_id)
+
+        events = [
+            {
+                "index": int(e.get("event_index", i)),
+                "type": e["type"],
+                "tx_id": e.get("transaction_id", tx_id),
+                "values": decode_payload(e["payload"]),
+            }
+            for i, e in enumerate(result.get("events") or [])
+        ]
+        nft_ids, fees = summarize_events(events)
+        error = result.get("error_message") or None
+        if result["status"] == "Expired":
+            error = error or "Transaction expired before it was sealed"
+        if error:
+            self.failed += 1
+        else:
+            self.sealed += 1
+        return {
+            "tx_id": tx_id,
+            "block_id": result.get("block_id"),
+            "block_height": await self.block_height(result["block_id"]) if result.get("block_id") else None,
+            "status": result["status"].upper(),
+            "error": error,
+            "events": events,
+            "nft_ids": nft_ids,
+            "fees": fees,
+            "returncode": 1 if error else 0,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    async def mint(self, items: List[Dict], signer_name: str) -> Dict:
+        """Mint items (dicts shaped like mint_metadata()) with mint_nft_batch.cdc"""
+        return await self.execute(
+            load_cadence(MINT_BATCH_TX), batch_mint_arguments(items), self.signer(signer_name)
+        )
+
+    # ---------- scripts ----------
+    async def run_script(self, script: bytes, arguments: List[Dict] = ()) -> Any:
+        self.scripts += 1
+        encoded = await self._request(
+            "POST", "/v1/scripts",
+            params={"block_height": "sealed"},
+            json={"script": b64(script), "arguments": [b64(encode_argument(a)) for a in arguments]},
+        )
+        return cadence_value(decode_payload(encoded))
+
+    async def get_ids(self, address: str) -> List[int]:
+        script = load_cadence(os.path.join(SCRIPTS_DIR, "get_ids.cdc"))
+        ids = await self.run_script(script, [{"type": "Address", "value": "0x" + address.removeprefix("0x")}])
+        return sorted(int(i) for i in ids)
+
+    async def get_ids_cached(self, address: str) -> List[int]:
+        if self.cache is None:
+            return await self.get_ids(address)
+        key = make_key("flow_ids", address.removeprefix("0x").lower())
+        return await self.cache.get_or_fetch("flow_ids", key, lambda: self.get_ids(address))
+
+    async def get_nfts_metadata(self, address: str, ids: List[int]) -> Dict[int, Dict[str, str]]:
+        """
+        Metadata for many IDs with get_NFTs_metadata.cdc, FLOW_METADATA_CHUNK
+        IDs per script call. NFT metadata never changes after minting, so with
+        a cache only IDs never seen before hit the chain. IDs that are not in
+        the collection are left out.
+        """
+        address = "0x" + address.removeprefix("0x").lower()
+        found: Dict[int, Dict[str, str]] = {}
+        missing = []
+        for nft_id in ids:
+            entry = self.cache.get(make_key("flow_nft", address, nft_id)) if self.cache else None
+            if entry is not None:
+                found[nft_id] = entry.value
+            else:
+                missing.append(nft_id)
+
+        script = load_cadence(os.path.join(SCRIPTS_DIR, "get_NFTs_metadata.cdc"))
+        chunks = [missing[i:i + FLOW_METADATA_CHUNK] for i in range(0, len(missing), FLOW_METADATA_CHUNK)]
+        results = await asyncio.gather(*[
+            self.run_script(script, [
+                {"type": "Address", "value": address},
+                {"type": "Array", "value": [{"type": "UInt64", "value": str(i)} for i in chunk]},
+            ])
+            for chunk in chunks
+        ])
+        for result in results:
+            for nft_id, metadata in result.items():
+                found[int(nft_id)] = metadata
+                if self.cache is not None:
+                    self.cache.set("flow_nft", make_key("flow_nft", address, int(nft_id)), metadata)
+        return {nft_id: found[nft_id] for nft_id in ids if nft_id in found}
+
+    async def get_collection_page(self, address: str, offset: int = 0, limit: int = 100) -> Dict:
+        """One page of an account's NFTs with metadata: one IDs call plus one bulk call at most"""
+        ids = await self.get_ids_cached(address)
+        page_ids = ids[offset:offset + limit]
+        metadata = await self.get_nfts_metadata(address, page_ids)
+        next_offset = offset + limit
+        return {
+            "address": address,
+            "total": len(ids),
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset if next_offset < len(ids) else None,
+            "nfts": [{**metadata[i], "id": i} for i in page_ids if i in metadata],
+        }
+
+    async def get_nft_metadata(self, address: str, nft_id: int) -> Dict[str, str]:
+        script = load_cadence(os.path.join(SCRIPTS_DIR, "get_NFT_metadata.cdc"))
+        return await self.run_script(script, [
+            {"type": "Address", "value": "0x" + address.removeprefix("0x")},
+            {"type": "UInt64", "value": str(nft_id)},
+        ])
+
+    def stats(self) -> Dict:
+        return {
+            "access_api": self.base_url,
+            "submitted": self.submitted,
+            "sealed": self.sealed,
+            "failed": self.failed,
+            "scripts": self.scripts,
+            "in_flight": self.submitted - self.sealed - self.failed,
+        }
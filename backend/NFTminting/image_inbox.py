@@ -0,0 +1,238 @@
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from NFTminting.mint import NFT_IMAGES_DIR, OUTPUT_DIR
+
+# Native file events need the optional `watchdog` package (pip install watchdog);
+# without it the inbox rescans the folder every INBOX_POLL_SECONDS instead
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+# =========================
+# Config (env-first)
+# =========================
+INBOX_POLL_SECONDS = float(os.getenv("INBOX_POLL_SECONDS") or 5)
+# Claim/mint log for the inbox (the SQLite MINT_DB_PATH holds transactions).
+# MINT_LEDGER_PATH is the old name; the file name stays so old logs are kept.
+MINT_INBOX_PATH = (
+    os.getenv("MINT_INBOX_PATH")
+    or os.getenv("MINT_LEDGER_PATH")
+    or os.path.join(OUTPUT_DIR, "mint_ledger.jsonl")
+)
+# A claim this old when the log is loaded belonged to a process that died
+# mid-mint; the file goes back in the inbox. Longer than a seal wait, so a
+# second process sharing the log (mint.py) keeps its live claims.
+INBOX_CLAIM_TTL = float(os.getenv("INBOX_CLAIM_TTL") or 900)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+CLAIMED, MINTED, RELEASED = "claimed", "minted", "released"
+
+
+class _InboxEvents(FileSystemEventHandler):
+    def __init__(self, inbox: "ImageInbox"):
+        self.inbox = inbox
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.inbox.add(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.inbox.add(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.inbox.discard(event.src_path)
+            self.inbox.add(event.dest_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.inbox.discard(event.src_path)
+
+
+class ImageInbox:
+    """
+    Index of mintable images in NFT_IMAGES_DIR, kept current by a watcher
+    instead of listing and stat-ing the whole folder on every mint.
+    Unminted images sit in a max-heap by mtime, so the newest one is at the
+    top. An append-only ledger records claims and mints, so an image is
+    handed out at most once, even across restarts.
+    """
+
+    def __init__(self, directory: str = NFT_IMAGES_DIR, ledger_path: str = MINT_INBOX_PATH):
+        self.directory = os.path.abspath(directory)
+        self.ledger_path = ledger_path
+        self._lock = threading.Lock()
+        # path -> mtime of every unminted image; the heap may hold stale
+        # entries, which are skipped when they reach the top
+        self._mtimes: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self.ledger: Dict[str, Dict] = self._load_ledger()
+        self.stale_claims_released = self._release_stale_claims()
+        self._observer = None
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.scans = 0
+
+    # ---------- ledger ----------
+    def _load_ledger(self) -> Dict[str, Dict]:
+        ledger = {}
+        try:
+            with open(self.ledger_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry["status"] == RELEASED:
+                        ledger.pop(entry["path"], None)
+                    else:
+                        ledger[entry["path"]] = entry
+        except FileNotFoundError:
+            pass
+        return ledger
+
+    def _release_stale_claims(self) -> int:
+        cutoff = time.time() - INBOX_CLAIM_TTL
+        stale = [
+            path for path, entry in self.ledger.items()
+            if entry["status"] == CLAIMED and entry.get("at", 0) < cutoff
+        ]
+        for path in stale:
+            print(f"⚠️ Releasing stale inbox claim from an earlier run: {path}")
+            self._record(path, RELEASED)
+        return len(stale)
+
+    def _record(self, path: str, status: str, **extra):
+        entry = {"path": path, "status": status, "at": time.time(), **extra}
+        if status == RELEASED:
+            self.ledger.pop(path, None)
+        else:
+            self.ledger[path] = entry
+        os.makedirs(os.path.dirname(self.ledger_path) or ".", exist_ok=True)
+        with open(self.ledger_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    # ---------- index ----------
+    @staticmethod
+    def _is_image(path: str) -> bool:
+        return path.lower().endswith(IMAGE_EXTENSIONS)
+
+    def add(self, path: str):
+        path = os.path.abspath(path)
+        if not self._is_image(path):
+            return
+        try:
+            mtime = os.path.getmtime(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if path in self.ledger or self._mtimes.get(path) == mtime:
+                return
+            self._mtimes[path] = mtime
+            heapq.heappush(self._heap, (-mtime, path))
+
+    def discard(self, path: str):
+        with self._lock:
+            self._mtimes.pop(os.path.abspath(path), None)
+
+    def scan(self):
+        """Full listing; used once at start-up and by the polling fallback"""
+        self.scans += 1
+        seen = set()
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            if entry.is_file() and self._is_image(entry.name):
+                path = os.path.abspath(entry.path)
+                seen.add(path)
+                if self._mtimes.get(path) != entry.stat().st_mtime:
+                    self.add(path)
+        with self._lock:
+            for path in [p for p in self._mtimes if p not in seen]:
+                del self._mtimes[path]
+
+    # ---------- claiming ----------
+    def claim_latest(self) -> Optional[str]:
+        """Newest unminted image, marked as claimed so nobody else gets it"""
+        with self._lock:
+            while self._heap:
+                neg_mtime, path = heapq.heappop(self._heap)
+                if self._mtimes.get(path) != -neg_mtime:
+                    continue  # deleted, re-modified or already claimed
+                del self._mtimes[path]
+                self._record(path, CLAIMED)
+                return path
+        return None
+
+    def claim(self, path: str) -> bool:
+        """Claim a specific file (e.g. a fresh upload); False if it was already taken"""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path in self.ledger:
+                return False
+            self._mtimes.pop(path, None)
+            self._record(path, CLAIMED)
+            return True
+
+    def mark_minted(self, path: str, nft_id: Optional[str], **extra):
+        with self._lock:
+            self._record(os.path.abspath(path), MINTED, nft_id=nft_id, **extra)
+
+    def release(self, path: str):
+        """Give a claimed image back after a failed mint"""
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self.ledger.get(path)
+            if entry is None or entry["status"] != CLAIMED:
+                return
+            self._record(path, RELEASED)
+        self.add(path)
+
+    # ---------- watching ----------
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.scan()
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(_InboxEvents(self), self.directory, recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._poller = threading.Thread(target=self._poll_forever, daemon=True)
+            self._poller.start()
+
+    def _poll_forever(self):
+        while not self._stop.wait(INBOX_POLL_SECONDS):
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"⚠️ Image inbox scan failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            minted = sum(1 for e in self.ledger.values() if e["status"] == MINTED)
+            return {
+                "directory": self.directory,
+                "watcher": "watchdog" if self._observer is not None else "polling",
+                "unminted": len(self._mtimes),
+                "claimed": len(self.ledger) - minted,
+                "minted": minted,
+                "scans": self.scans,
+                "stale_claims_released": self.stale_claims_released,
+            }
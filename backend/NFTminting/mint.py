@@ -1,35 +1,86 @@
+import asyncio
+import json
 import os
+import shlex
 import subprocess
 import sys
 import re
+import time
 
 # CONFIG
-NFT_IMAGES_DIR = "C:/Users/Atharav Jadhav/Downloads"
+NFT_IMAGES_DIR = os.getenv("NFT_IMAGES_DIR") or "C:/Users/Atharav Jadhav/Downloads"
 SIGNER = "testnet-deployer"
 NETWORK = "testnet"
 CONTRACT_ADDR = "0x8e1e0dc93cf85473"
-OUTPUT_DIR = "C:/Users/Atharav Jadhav/nft-brand-collaborator/backend/NFTminting/output_information"   # folder for per-NFT logs
+OUTPUT_DIR = os.getenv("MINT_OUTPUT_DIR") or "C:/Users/Atharav Jadhav/nft-brand-collaborator/backend/NFTminting/output_information"   # folder for the mint ledger
+# Flow CLI executable; point at mock_flow.py to develop without a network, e.g.
+# FLOW_CLI="python NFTminting/mock_flow.py"
+FLOW_CLI = os.getenv("FLOW_CLI") or "flow"
+# flow.json lives in backend/, and transaction paths are relative to it
+FLOW_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MINT_TX = "./NFTminting/cadence/transactions/mint_nft.cdc"
+MINT_BATCH_TX = "./NFTminting/cadence/transactions/mint_nft_batch.cdc"
+
+EVENT_TYPE_RE = re.compile(r"^\s*Type\s+(\S+)")
+EVENT_ID_RE = re.compile(r"- id \(UInt64\): (\d+)")
+
+DEPOSIT_EVENT = "MyImageNFTv2.Deposit"
+FEES_EVENT = "FlowFees.FeesDeducted"
 
 # Make sure the output folder exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
-def run_command(command):
-    """Run a shell command and capture only the final transaction result."""
-    print(f"\n>>> Running: {command}")
+def build_mint_args(name, description, image_url, external_url, signer=SIGNER, network=NETWORK):
+    """argv for a single mint transaction (no shell, so no quoting issues)"""
+    return shlex.split(FLOW_CLI) + [
+        "transactions", "send", MINT_TX,
+        CONTRACT_ADDR, name, description, image_url, external_url,
+        "--network", network, "--signer", signer, "--output", "json",
+    ]
 
-    result = subprocess.run(
-        command,
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        encoding="utf-8",
-        errors="replace"
-    )
 
-    output = result.stdout
+def batch_mint_arguments(items):
+    """JSON-Cadence arguments for mint_nft_batch.cdc"""
+    def strings(key):
+        return {"type": "Array", "value": [{"type": "String", "value": i[key]} for i in items]}
+
+    return [
+        {"type": "Address", "value": CONTRACT_ADDR},
+        strings("name"), strings("description"), strings("image_url"), strings("external_url"),
+    ]
+
 
+def build_batch_mint_args(items, signer=SIGNER, network=NETWORK):
+    """
+    argv for one transaction minting every item (dicts shaped like
+    mint_metadata()). Arrays can't be passed positionally, so all
+    arguments go through --args-json.
+    """
+    return shlex.split(FLOW_CLI) + [
+        "transactions", "send", MINT_BATCH_TX,
+        "--args-json", json.dumps(batch_mint_arguments(items)),
+        "--network", network, "--signer", signer, "--output", "json",
+    ]
+
+
+def parse_minted_ids(output):
+    """IDs from MyImageNFTv2.Deposit events, in emission (= mint) order"""
+    ids = []
+    event_type = None
+    for line in output.splitlines():
+        match = EVENT_TYPE_RE.match(line)
+        if match:
+            event_type = match.group(1)
+            continue
+        match = EVENT_ID_RE.search(line)
+        if match and event_type and event_type.endswith("MyImageNFTv2.Deposit"):
+            ids.append(match.group(1))
+    return ids
+
+
+def parse_mint_output(output):
+    """Trim CLI output to the transaction result and pull out the minted NFT ID"""
     # ✅ Extract only from "Block ID" onwards
     if "Block ID" in output:
         final_output = output.split("Block ID", 1)[1]
@@ -37,57 +88,176 @@ def run_command(command):
     else:
         final_output = output
 
-    print(final_output)
-
     # ✅ Extract NFT ID from output
     nft_id = None
     match = re.search(r"- id \(UInt64\): (\d+)", final_output)
     if match:
         nft_id = match.group(1)
+    return final_output, nft_id
+
+
+def cadence_value(value):
+    """Plain Python value from a JSON-Cadence value ({"type": ..., "value": ...})"""
+    while isinstance(value, dict) and "value" in value:
+        kind = value.get("type")
+        if kind in ("Event", "Struct", "Resource"):
+            return {f["name"]: cadence_value(f["value"]) for f in value["value"].get("fields", [])}
+        if kind == "Array":
+            return [cadence_value(v) for v in value["value"]]
+        if kind == "Dictionary":
+            return {cadence_value(kv["key"]): cadence_value(kv["value"]) for kv in value["value"]}
+        value = value["value"]
+    return value
+
+
+def event_fields(event):
+    """Field name -> value for one event of `flow ... --output json`"""
+    values = event.get("values")
+    if isinstance(values, dict) and "fields" in values:
+        values = {"type": "Event", "value": values}
+    fields = cadence_value(values)
+    return fields if isinstance(fields, dict) else {}
+
+
+def summarize_events(events):
+    """(minted NFT IDs in order, fees paid or None) from a transaction's events"""
+    nft_ids, fees = [], None
+    for event in events:
+        fields = event_fields(event)
+        if event.get("type", "").endswith(DEPOSIT_EVENT) and "id" in fields:
+            nft_ids.append(str(fields["id"]))
+        elif event.get("type", "").endswith(FEES_EVENT) and "amount" in fields:
+            fees = float(fields["amount"])
+    return nft_ids, fees
 
-    # Save to a per-NFT file
-    if nft_id:
-        file_path = os.path.join(OUTPUT_DIR, f"{nft_id}.txt")
-    else:
-        file_path = os.path.join(OUTPUT_DIR, "unknown.txt")
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(final_output)
+def parse_flow_result(stdout, stderr="", returncode=0):
+    """
+    Structured record from `flow transactions send --output json`.
+    Falls back to scraping text output when the CLI failed before it could
+    print a result. stderr only counts as the error when there is no JSON
+    result or the CLI exited non-zero: the CLI also writes warnings there
+    (e.g. "Version warning") for transactions that sealed fine.
+    """
+    try:
+        tx = json.loads(stdout)
+    except ValueError:
+        final_output, _ = parse_mint_output(stdout + stderr)
+        return {
+            "tx_id": None, "block_id": None, "block_height": None, "status": None,
+            "error": final_output.strip() or None, "events": [],
+            "nft_ids": parse_minted_ids(final_output), "fees": None,
+        }
 
-    print(f"✅ Saved transaction info to {file_path}")
+    events = tx.get("events") or []
+    nft_ids, fees = summarize_events(events)
+    return {
+        "tx_id": tx.get("id"),
+        "block_id": tx.get("block_id"),
+        "block_height": tx.get("block_height"),
+        "status": tx.get("status"),
+        "error": tx.get("error") or ((stderr.strip() or None) if returncode != 0 else None),
+        "events": events,
+        "nft_ids": nft_ids,
+        "fees": fees,
+    }
+
+
+def run_command(command):
+    """Run a flow command and return the structured transaction result."""
+    print(f"\n>>> Running: {shlex.join(command)}")
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        command,
+        cwd=FLOW_PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace"
+    )
+    record = parse_flow_result(result.stdout, result.stderr, result.returncode)
+    record["returncode"] = result.returncode
+    record["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+async def run_command_async(args):
+    """asyncio twin of run_command: the event loop keeps running while Flow seals"""
+    print(f"\n>>> Running: {shlex.join(args)}")
+
+    started = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        cwd=FLOW_PROJECT_DIR,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    record = parse_flow_result(
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+        proc.returncode,
+    )
+    record["returncode"] = proc.returncode
+    record["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+async def run_batch_async(items, signer=SIGNER):
+    """Mint all items in one transaction; returns the structured transaction result"""
+    print(f"\n>>> Running batch mint of {len(items)} NFTs as {signer}")
+    return await run_command_async(build_batch_mint_args(items, signer=signer))
+
+
+def mint_metadata(file_path, name=None, description=None):
+    """Metadata for minting a local file"""
+    filename = os.path.basename(file_path)
+    return {
+        "name": name or f"My NFT ({filename})",
+        "description": description or f"Minted from local file: {filename}",
+        "image_url": f"file://{os.path.abspath(file_path)}",
+        "external_url": "https://example.com",
+    }
+
+
+def mint_image(file_path, name=None, description=None):
+    """Mint one local image; returns (transaction record, metadata)"""
+    meta = mint_metadata(file_path, name, description)
+    record = run_command(build_mint_args(
+        meta["name"], meta["description"], meta["image_url"], meta["external_url"]
+    ))
+    return record, meta
 
 
 def mint_latest():
     """Mint NFT only for the latest image in the folder."""
-    # Get all files in NFT_IMAGES_DIR
-    files = [
-        os.path.join(NFT_IMAGES_DIR, f)
-        for f in os.listdir(NFT_IMAGES_DIR)
-        if os.path.isfile(os.path.join(NFT_IMAGES_DIR, f))
-    ]
+    from NFTminting.image_inbox import ImageInbox
+    from NFTminting.mint_ledger import MintLedger
 
-    if not files:
-        print("❌ No images found in the folder.")
+    # The inbox log skips images that were already minted
+    inbox = ImageInbox()
+    inbox.scan()
+    latest_file = inbox.claim_latest()
+    if latest_file is None:
+        print("❌ No unminted images found in the folder.")
         return
 
-    # Pick latest file by modification time
-    latest_file = max(files, key=os.path.getmtime)
-    filename = os.path.basename(latest_file)
-
-    # Metadata
-    name = f"My NFT ({filename})"
-    description = f"Minted from local file: {filename}"
-    image_url = f"file://{os.path.abspath(latest_file)}"
-    external_url = "https://example.com"
-
-    # Build Flow command
-    mint_cmd = (
-        f'flow transactions send ./NFTminting/cadence/transactions/mint_nft.cdc '
-        f'{CONTRACT_ADDR} "{name}" "{description}" "{image_url}" "{external_url}" '
-        f'--network {NETWORK} --signer {SIGNER}'
-    )
+    record, meta = mint_image(latest_file)
+    if record["returncode"] != 0 or record["error"]:
+        print(f"❌ Mint failed: {record['error']}")
+        inbox.release(latest_file)
+        return
+    if not record["nft_ids"]:
+        # Sealed, so the NFT exists; only its ID is unknown. Don't mint it again.
+        MintLedger().record(record, [], SIGNER)
+        inbox.mark_minted(latest_file, None, tx_id=record["tx_id"])
+        print(f"⚠️ Tx {record['tx_id']} sealed but its NFT ID could not be parsed")
+        return
 
-    run_command(mint_cmd)
+    MintLedger().record(record, [dict(meta, file_path=latest_file)], SIGNER)
+    inbox.mark_minted(latest_file, record["nft_ids"][0])
+    print(f"✅ Minted NFT {record['nft_ids'][0]} in tx {record['tx_id']}")
 
 
 if __name__ == "__main__":
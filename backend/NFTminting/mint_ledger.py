@@ -0,0 +1,142 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from NFTminting.mint import OUTPUT_DIR
+
+# =========================
+# Config (env-first)
+# =========================
+MINT_DB_PATH = os.getenv("MINT_DB_PATH") or os.path.join(OUTPUT_DIR, "mints.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    tx_id TEXT PRIMARY KEY,
+    block_id TEXT,
+    block_height INTEGER,
+    status TEXT,
+    error TEXT,
+    signer TEXT,
+    fees REAL,
+    latency_ms REAL,
+    batch_size INTEGER,
+    events TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS mints (
+    nft_id INTEGER PRIMARY KEY,
+    tx_id TEXT NOT NULL REFERENCES transactions(tx_id),
+    name TEXT,
+    description TEXT,
+    image_url TEXT,
+    external_url TEXT,
+    brand TEXT,
+    file_path TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mints_brand_created ON mints (brand, created_at);
+CREATE INDEX IF NOT EXISTS mints_created ON mints (created_at);
+CREATE INDEX IF NOT EXISTS mints_tx ON mints (tx_id);
+"""
+
+
+class MintLedger:
+    """
+    SQLite record of every sealed mint transaction and the NFTs it created,
+    indexed for lookups by NFT ID, brand and time range (replaces one .txt
+    log per NFT).
+    """
+
+    def __init__(self, path: str = MINT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def record(self, tx: Dict, items: List[Dict], signer: str):
+        """Store one transaction result and one row per minted item (same order as tx["nft_ids"])"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    tx["tx_id"], tx.get("block_id"), tx.get("block_height"), tx.get("status"),
+                    tx.get("error"), signer, tx.get("fees"), tx.get("latency_ms"),
+                    len(items), json.dumps(tx.get("events") or []), now,
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO mints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        int(nft_id), tx["tx_id"], item.get("name"), item.get("description"),
+                        item.get("image_url"), item.get("external_url"), item.get("brand"),
+                        item.get("file_path"), now,
+                    )
+                    for nft_id, item in zip(tx["nft_ids"], items)
+                ],
+            )
+            self._conn.commit()
+
+    _SELECT = (
+        "SELECT m.*, t.block_id, t.block_height, t.status, t.signer, t.fees,"
+        " t.latency_ms, t.batch_size FROM mints m JOIN transactions t USING (tx_id)"
+    )
+
+    def get(self, nft_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(f"{self._SELECT} WHERE m.nft_id = ?", (nft_id,)).fetchone()
+            if row is None:
+                return None
+            mint = dict(row)
+            (events,) = self._conn.execute(
+                "SELECT events FROM transactions WHERE tx_id = ?", (mint["tx_id"],)
+            ).fetchone()
+        mint["events"] = json.loads(events)
+        return mint
+
+    def query(
+        self,
+        brand: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Dict]:
+        """Newest first; every filter is optional"""
+        where, params = [], []
+        if brand is not None:
+            where.append("m.brand = ?")
+            params.append(brand)
+        if since is not None:
+            where.append("m.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("m.created_at < ?")
+            params.append(until)
+        sql = self._SELECT
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY m.created_at DESC, m.nft_id DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            mints, txs, fees, latency = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM mints), COUNT(*), SUM(fees), AVG(latency_ms)"
+                " FROM transactions"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "mints": mints,
+            "transactions": txs,
+            "total_fees": fees or 0.0,
+            "avg_latency_ms": round(latency or 0.0, 1),
+        }
@@ -0,0 +1,296 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from jobs import Job, JobQueue
+from NFTminting.mint import (
+    SIGNER, build_mint_args, mint_metadata, run_batch_async, run_command_async,
+)
+
+# =========================
+# Config (env-first)
+# =========================
+MINT_WORKERS = int(os.getenv("MINT_WORKERS") or 4)
+MINT_QUEUE_SIZE = int(os.getenv("MINT_QUEUE_SIZE") or 100)
+# Up to this many mints share one transaction; 1 sends each mint on its own
+MINT_BATCH_SIZE = int(os.getenv("MINT_BATCH_SIZE") or 20)
+# How long the first request in a batch waits for company
+MINT_BATCH_WINDOW = float(os.getenv("MINT_BATCH_WINDOW") or 2.0)
+# "cli" spawns `flow transactions send`; "rest" signs and submits in process
+# through the access API (NFTminting/flow_client.py)
+MINT_BACKEND = os.getenv("MINT_BACKEND") or "cli"
+
+
+class MintFailed(Exception):
+    pass
+
+
+class MintUnconfirmed(MintFailed):
+    """
+    The transaction sealed without an error, so (Cadence transactions being
+    atomic) every NFT in it was minted, but not all IDs could be read from
+    its Deposit events. Retrying would mint the same image twice.
+    """
+
+    def __init__(self, message: str, tx_id: Optional[str]):
+        super().__init__(message)
+        self.tx_id = tx_id
+
+
+def mint_error(tx: Dict) -> str:
+    return tx["error"] or f"flow exited with status {tx['returncode']}"
+
+
+def check_minted(tx: Dict, expected: int):
+    """Raise MintFailed unless the transaction sealed with (at least) `expected` new NFTs"""
+    if tx["returncode"] != 0 or tx["error"]:
+        raise MintFailed(mint_error(tx))
+    if len(tx["nft_ids"]) < expected:
+        raise MintUnconfirmed(
+            f"transaction {tx['tx_id']} sealed, but only {len(tx['nft_ids'])}/{expected} "
+            "NFT IDs could be parsed from its events",
+            tx["tx_id"],
+        )
+
+
+def mint_result(tx: Dict, nft_id: str, batch_size: int) -> Dict:
+    return {
+        "nft_id": nft_id,
+        "tx_id": tx["tx_id"],
+        "block_height": tx["block_height"],
+        "fees": tx["fees"],
+        "latency_ms": tx["latency_ms"],
+        "batch_size": batch_size,
+    }
+
+
+class MintBatcher:
+    """
+    Collects mints for one signer and sends them as a single
+    mint_nft_batch.cdc transaction once `max_items` are waiting or `window`
+    seconds after the first one arrived, whichever comes first. Each caller
+    gets back its own NFT ID.
+    """
+
+    def __init__(self, signer: str, send: Callable[[List[Dict]], Awaitable[Dict]],
+                 max_items: int = MINT_BATCH_SIZE, window: float = MINT_BATCH_WINDOW,
+                 ledger=None):
+        self.signer = signer
+        self.send = send
+        self.ledger = ledger
+        self.max_items = max_items
+        self.window = window
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._sending = set()
+        self.batches = 0
+        self.items = 0
+        # Sealed batches whose events yielded fewer IDs than items
+        self.unparsed_batches = 0
+
+    async def mint(self, meta: Dict) -> Dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((meta, future))
+        if len(self._pending) >= self.max_items:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    def close(self):
+        """Drop whatever has not been sent yet (shutdown)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending = []
+
+    async def _send(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        items = [meta for meta, _ in batch]
+        try:
+            tx = await self.send(items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Deposit events follow the transaction's mint loop, so the i-th ID belongs
+        # to the i-th item. A sealed transaction is all or nothing: fewer IDs than
+        # items means the events were not fully parsed, not that some mints failed.
+        try:
+            check_minted(tx, len(batch))
+        except MintUnconfirmed as e:
+            self.unparsed_batches += 1
+            if self.ledger is not None:
+                # Keep the transaction and its raw events, but no guessed ID pairing
+                self._record(dict(tx, nft_ids=[]), items)
+            self._fail(batch, e)
+            return
+        except MintFailed as e:
+            self._fail(batch, e)
+            return
+
+        if self.ledger is not None:
+            self._record(tx, items)
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future), nft_id in zip(batch, tx["nft_ids"]):
+            if not future.done():
+                future.set_result(mint_result(tx, nft_id, len(batch)))
+
+    def _record(self, tx: Dict, items: List[Dict]):
+        try:
+            self.ledger.record(tx, items, self.signer)
+        except Exception as e:
+            print(f"⚠️ Mint ledger write failed for {tx['tx_id']}: {e}")
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Dict, asyncio.Future]], error: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def stats(self) -> Dict:
+        return {
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "items": self.items,
+            "unparsed_batches": self.unparsed_batches,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+class MintingService:
+    """
+    Runs `flow transactions send` as asyncio subprocesses on a bounded worker
+    pool. Transactions from the same signer are sent one at a time: the CLI
+    reads the proposal key's sequence number when it builds the transaction,
+    so two in flight for one signer would collide. Different signers run in
+    parallel. With batch_size > 1, mints are grouped per signer by a
+    MintBatcher so one transaction (and one seal wait) covers many NFTs.
+    Given a FlowAccessClient, transactions are sent through it instead; it
+    tracks sequence numbers itself, so one signer can have several in flight.
+    """
+
+    def __init__(self, workers: int = MINT_WORKERS, max_queue: int = MINT_QUEUE_SIZE,
+                 batch_size: int = MINT_BATCH_SIZE, batch_window: float = MINT_BATCH_WINDOW,
+                 inbox=None, ledger=None, flow=None):
+        self.inbox = inbox
+        self.flow = flow
+        self.ledger = ledger
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        # Jobs waiting on a batch are idle coroutines, so allow a full batch to gather
+        if batch_size > 1:
+            workers = max(workers, batch_size)
+        self.jobs = JobQueue(workers=workers, max_queue=max_queue)
+        self._signer_locks: Dict[str, asyncio.Lock] = {}
+        self._batchers: Dict[str, MintBatcher] = {}
+
+    async def start(self):
+        await self.jobs.start()
+
+    async def stop(self):
+        for batcher in self._batchers.values():
+            batcher.close()
+        await self.jobs.stop()
+
+    def _signer_lock(self, signer: str) -> asyncio.Lock:
+        lock = self._signer_locks.get(signer)
+        if lock is None:
+            lock = self._signer_locks[signer] = asyncio.Lock()
+        return lock
+
+    def _batcher(self, signer: str) -> MintBatcher:
+        batcher = self._batchers.get(signer)
+        if batcher is None:
+            batcher = self._batchers[signer] = MintBatcher(
+                signer, lambda items: self._send(items, signer),
+                self.batch_size, self.batch_window, ledger=self.ledger,
+            )
+        return batcher
+
+    async def _send(self, items: List[Dict], signer: str) -> Dict:
+        """One transaction minting `items`; returns its structured result"""
+        if self.flow is not None:
+            return await self.flow.mint(items, signer)
+        async with self._signer_lock(signer):
+            if len(items) > 1:
+                return await run_batch_async(items, signer=signer)
+            item = items[0]
+            return await run_command_async(build_mint_args(
+                item["name"], item["description"], item["image_url"], item["external_url"],
+                signer=signer,
+            ))
+
+    async def _mint(self, item: Dict, signer: str) -> Dict:
+        if self.batch_size > 1:
+            return await self._batcher(signer).mint(item)
+
+        tx = await self._send([item], signer)
+        try:
+            check_minted(tx, 1)
+        except MintUnconfirmed:
+            if self.ledger is not None:
+                self.ledger.record(dict(tx, nft_ids=[]), [item], signer)
+            raise
+        if self.ledger is not None:
+            self.ledger.record(tx, [item], signer)
+        return mint_result(tx, tx["nft_ids"][0], 1)
+
+    def submit(self, name, description, image_url, external_url,
+               brand: Optional[str] = None, signer: str = SIGNER) -> Job:
+        item = {
+            "name": name, "description": description, "image_url": image_url,
+            "external_url": external_url, "brand": brand,
+        }
+        return self.jobs.submit("mint-nft", self._mint, item, signer)
+
+    async def _mint_file(self, item: Dict, signer: str):
+        file_path = item["file_path"]
+        try:
+            result = await self._mint(item, signer)
+        except MintUnconfirmed as e:
+            # On chain under an unknown ID: releasing the file would mint it again
+            if self.inbox is not None:
+                self.inbox.mark_minted(file_path, None, tx_id=e.tx_id)
+            raise
+        except BaseException:
+            if self.inbox is not None:
+                self.inbox.release(file_path)
+            raise
+        if self.inbox is not None:
+            self.inbox.mark_minted(file_path, result["nft_id"])
+        return result
+
+    def submit_file(self, file_path, name=None, description=None,
+                    brand: Optional[str] = None, signer: str = SIGNER) -> Job:
+        """Mint a local image; with an inbox, the file must already be claimed"""
+        item = dict(mint_metadata(file_path, name, description), brand=brand, file_path=file_path)
+        return self.jobs.submit("mint-nft", self._mint_file, item, signer)
+
+    def stats(self) -> Dict:
+        return {
+            **self.jobs.stats(),
+            "inbox": self.inbox.stats() if self.inbox is not None else None,
+            "ledger": self.ledger.stats() if self.ledger is not None else None,
+            "backend": "rest" if self.flow is not None else "cli",
+            "flow": self.flow.stats() if self.flow is not None else None,
+            "signers_busy": [s for s, lock in self._signer_locks.items() if lock.locked()],
+            "batch_size": self.batch_size,
+            "batch_window": self.batch_window,
+            "batches": {s: b.stats() for s, b in self._batchers.items()},
+        }
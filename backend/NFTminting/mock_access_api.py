@@ -0,0 +1,148 @@
+# backend/NFTminting/mock_access_api.py
+# Local stand-in for the Flow REST access API, enough for flow_client.py:
+#   uvicorn NFTminting.mock_access_api:app --port 8888
+#   MINT_BACKEND=rest FLOW_ACCESS_API=http://127.0.0.1:8888 uvicorn app:app
+# Transactions seal MOCK_SEAL_DELAY seconds after submission and emit one
+# MyImageNFTv2.Deposit per minted item. Proposal-key sequence numbers are
+# enforced, so sequencing bugs show up as 400s like they would on a real node.
+# Signatures are not verified (use the emulator for that).
+import base64
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+MOCK_SEAL_DELAY = float(os.getenv("MOCK_SEAL_DELAY") or 0.5)
+CONTRACT = "A.8e1e0dc93cf85473.MyImageNFTv2"
+
+app = FastAPI()
+sequence_numbers = {}   # (address, key index) -> next sequence number
+transactions = {}       # tx id -> (submitted at, events)
+collections = {}        # address -> {nft id: metadata}
+next_nft_id = 1
+block_height = 1000
+
+
+def encode(value):
+    return base64.b64encode(json.dumps(value).encode()).decode()
+
+
+def decode(value):
+    return json.loads(base64.b64decode(value))
+
+
+def event(tx_id, index, event_type, fields):
+    return {
+        "type": event_type,
+        "transaction_id": tx_id,
+        "transaction_index": "0",
+        "event_index": str(index),
+        "payload": encode({"type": "Event", "value": {"id": event_type, "fields": fields}}),
+    }
+
+
+@app.get("/v1/blocks")
+def latest_block(height: str = "sealed"):
+    global block_height
+    block_height += 1
+    return [{"header": {"id": uuid.uuid4().hex * 2, "height": str(block_height)}}]
+
+
+@app.get("/v1/blocks/{block_id}")
+def get_block(block_id: str):
+    return [{"header": {"id": block_id, "height": str(block_height)}}]
+
+
+@app.get("/v1/accounts/{address}")
+def get_account(address: str, expand: str = ""):
+    address = address.removeprefix("0x")
+    return {
+        "address": address,
+        "keys": [{"index": "0", "sequence_number": str(sequence_numbers.get((address, 0), 0))}],
+    }
+
+
+@app.post("/v1/transactions")
+def send_transaction(body: dict):
+    global next_nft_id
+    proposal = body["proposal_key"]
+    key = (proposal["address"], int(proposal["key_index"]))
+    expected = sequence_numbers.get(key, 0)
+    if int(proposal["sequence_number"]) != expected:
+        return JSONResponse(
+            {"code": 400, "message": f"invalid proposal key: expected sequence number {expected}"},
+            status_code=400,
+        )
+    sequence_numbers[key] = expected + 1
+
+    tx_id = uuid.uuid4().hex * 2
+    args = [decode(a) for a in body["arguments"]]
+    recipient = args[0]["value"].removeprefix("0x")
+    names = args[1]["value"] if args[1]["type"] == "Array" else [args[1]]
+    events = []
+    for i, name in enumerate(names):
+        nft_id = next_nft_id
+        next_nft_id += 1
+        collections.setdefault(recipient, {})[nft_id] = {
+            "id": str(nft_id),
+            "name": name["value"],
+            "description": (args[2]["value"][i] if args[2]["type"] == "Array" else args[2])["value"],
+            "imageURI": (args[3]["value"][i] if args[3]["type"] == "Array" else args[3])["value"],
+            "externalURL": (args[4]["value"][i] if args[4]["type"] == "Array" else args[4])["value"],
+        }
+        events.append(event(tx_id, i, f"{CONTRACT}.Deposit", [
+            {"name": "id", "value": {"type": "UInt64", "value": str(nft_id)}},
+            {"name": "to", "value": {"type": "Optional", "value": {"type": "Address", "value": "0x" + recipient}}},
+        ]))
+    events.append(event(tx_id, len(events), "A.912d5440f7e3769e.FlowFees.FeesDeducted", [
+        {"name": "amount", "value": {"type": "UFix64", "value": f"{0.00001 * (1 + len(names) / 10):.8f}"}},
+    ]))
+    transactions[tx_id] = (time.time(), events)
+    return {"id": tx_id}
+
+
+@app.get("/v1/transaction_results/{tx_id}")
+def transaction_result(tx_id: str):
+    if tx_id not in transactions:
+        return JSONResponse({"code": 404, "message": "transaction not found"}, status_code=404)
+    submitted_at, events = transactions[tx_id]
+    sealed = time.time() - submitted_at >= MOCK_SEAL_DELAY
+    return {
+        "block_id": uuid.uuid4().hex * 2,
+        "status": "Sealed" if sealed else "Pending",
+        "status_code": 0,
+        "error_message": "",
+        "computation_used": "10",
+        "events": events if sealed else [],
+    }
+
+
+@app.post("/v1/scripts")
+def run_script(body: dict, block_height: str = "sealed"):
+    script = base64.b64decode(body["script"]).decode()
+    args = [decode(a) for a in body["arguments"]]
+    owned = collections.get(args[0]["value"].removeprefix("0x"), {})
+    if "getIDs" in script:
+        result = {"type": "Array", "value": [{"type": "UInt64", "value": str(i)} for i in owned]}
+    elif args[1]["type"] == "Array":
+        # get_NFTs_metadata.cdc: {UInt64: {String: String}}, unknown IDs skipped
+        result = {"type": "Dictionary", "value": [
+            {"key": {"type": "UInt64", "value": str(i)}, "value": string_dict(owned[i])}
+            for i in (int(v["value"]) for v in args[1]["value"]) if i in owned
+        ]}
+    else:
+        nft = owned.get(int(args[1]["value"]))
+        if nft is None:
+            return JSONResponse({"code": 400, "message": "Could not borrow NFT reference"}, status_code=400)
+        result = string_dict(nft)
+    return encode(result)
+
+
+def string_dict(values):
+    return {"type": "Dictionary", "value": [
+        {"key": {"type": "String", "value": k}, "value": {"type": "String", "value": v}}
+        for k, v in values.items()
+    ]}
@@ -0,0 +1,120 @@
+# backend/NFTminting/mock_flow.py
+# Stand-in for the `flow` CLI so minting can be exercised without a network:
+#   FLOW_CLI="python NFTminting/mock_flow.py" uvicorn app:app
+# Prints output shaped like `flow transactions send` and emits a fresh NFT ID
+# per call. MOCK_FLOW_DELAY (seconds) simulates the seal wait, MOCK_FLOW_FAIL=1
+# makes every call fail.
+import json
+import os
+import sys
+import time
+import uuid
+
+COUNTER_FILE = os.getenv("MOCK_FLOW_COUNTER") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".mock_flow_counter"
+)
+
+
+def next_nft_id():
+    """Monotonic ID shared between processes (best effort, fine for dev)"""
+    try:
+        with open(COUNTER_FILE, "r", encoding="utf-8") as f:
+            current = int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        current = 0
+    with open(COUNTER_FILE, "w", encoding="utf-8") as f:
+        f.write(str(current + 1))
+    return current + 1
+
+
+def main(argv):
+    if argv[:2] != ["transactions", "send"]:
+        print(f"mock flow: unsupported command {' '.join(argv)}")
+        return 1
+
+    time.sleep(float(os.getenv("MOCK_FLOW_DELAY") or 0.5))
+    tx_id = uuid.uuid4().hex + uuid.uuid4().hex
+    if os.getenv("MOCK_FLOW_FAIL") == "1":
+        print("❌ Transaction Error\nexecution error code 1101: mock failure", file=sys.stderr)
+        return 1
+
+    # Batch mints pass their arrays via --args-json; one NFT per array entry
+    count = 1
+    if "--args-json" in argv:
+        args_json = json.loads(argv[argv.index("--args-json") + 1])
+        count = len(args_json[1]["value"])
+    nft_ids = [next_nft_id() for _ in range(count)]
+    signer = argv[argv.index("--signer") + 1] if "--signer" in argv else "unknown"
+    block_id = uuid.uuid4().hex + uuid.uuid4().hex
+    if "--output" in argv and argv[argv.index("--output") + 1] == "json":
+        print_json(tx_id, block_id, signer, nft_ids)
+    else:
+        print_text(tx_id, block_id, signer, nft_ids)
+    return 0
+
+
+def deposit_event(tx_id, index, nft_id):
+    return {
+        "index": index,
+        "type": "A.8e1e0dc93cf85473.MyImageNFTv2.Deposit",
+        "tx_id": tx_id,
+        "values": {
+            "type": "Event",
+            "value": {
+                "id": "A.8e1e0dc93cf85473.MyImageNFTv2.Deposit",
+                "fields": [
+                    {"name": "id", "value": {"type": "UInt64", "value": str(nft_id)}},
+                    {"name": "to", "value": {"type": "Optional", "value": {
+                        "type": "Address", "value": "0x8e1e0dc93cf85473"}}},
+                ],
+            },
+        },
+    }
+
+
+def print_json(tx_id, block_id, signer, nft_ids):
+    events = [deposit_event(tx_id, i, nft_id) for i, nft_id in enumerate(nft_ids)]
+    events.append({
+        "index": len(events),
+        "type": "A.912d5440f7e3769e.FlowFees.FeesDeducted",
+        "tx_id": tx_id,
+        "values": {"type": "Event", "value": {
+            "id": "A.912d5440f7e3769e.FlowFees.FeesDeducted",
+            "fields": [
+                {"name": "amount", "value": {"type": "UFix64", "value": f"{0.00001 * (1 + len(nft_ids) / 10):.8f}"}},
+                {"name": "inclusionEffort", "value": {"type": "UFix64", "value": "1.00000000"}},
+                {"name": "executionEffort", "value": {"type": "UFix64", "value": "0.00000800"}},
+            ],
+        }},
+    })
+    print(json.dumps({
+        "id": tx_id,
+        "block_id": block_id,
+        "block_height": 123456,
+        "status": "SEALED",
+        "payer": signer,
+        "authorizers": "[8e1e0dc93cf85473]",
+        "events": events,
+    }))
+
+
+def print_text(tx_id, block_id, signer, nft_ids):
+    print(f"Transaction ID: {tx_id}\n")
+    print(f"Block ID\t{block_id}")
+    print("Block Height\t123456")
+    print("Status\t\t✅ SEALED")
+    print(f"ID\t\t{tx_id}")
+    print(f"Payer\t\t{signer}")
+    print("Authorizers\t[8e1e0dc93cf85473]\n")
+    print("Events:\n")
+    for index, nft_id in enumerate(nft_ids):
+        print(f"    Index\t{index}")
+        print("    Type\tA.8e1e0dc93cf85473.MyImageNFTv2.Deposit")
+        print(f"    Tx ID\t{tx_id}")
+        print("    Values")
+        print(f"\t\t- id (UInt64): {nft_id}")
+        print("\t\t- to (Address?): 0x8e1e0dc93cf85473\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,3 +1,6 @@
+import json
+import time
+
 import requests
 
 API_URL = "http://127.0.0.1:8000/api/mint-nft"
@@ -8,11 +11,22 @@ with open(IMAGE_PATH, "rb") as img:
     data = {"brand": "TestBrand"}
     resp = requests.post(API_URL, files=files, data=data)
 
-if resp.status_code == 200:
-    # Save the response to txt file
-    out_path = "minted_nft_info.txt"
-    with open(out_path, "wb") as f:
-        f.write(resp.content)
-    print(f"✅ NFT minted! Info saved to {out_path}")
+if resp.status_code == 202:
+    # Minting is queued; poll until the transaction is sealed
+    status_url = "http://127.0.0.1:8000" + resp.json()["status_url"]
+    while True:
+        job = requests.get(status_url).json()
+        if job["status"] in ("done", "failed"):
+            break
+        time.sleep(2)
+
+    if job["status"] == "done":
+        # Save the response to txt file
+        out_path = "minted_nft_info.txt"
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(job["result"], indent=2))
+        print(f"✅ NFT {job['result']['nft_id']} minted! Info saved to {out_path}")
+    else:
+        print("❌ Error:", job.get("error"))
 else:
     print("❌ Error:", resp.text)
@@ -1,20 +1,78 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Request
 import httpx
 import os
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI, UploadFile, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+import json
 import shutil
 import os
 import base64
 import requests
-import tempfile
 import traceback
-from test import edit_image  # import your edit_image function
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from test import PROMPT_VERSION, edit_image_bytes  # import your edit_image function
 load_dotenv()
 
-app = FastAPI()
+from edit_cache import EditCache
+from jobs import JobQueue, QueueFull
+from NFTminting.flow_client import FlowAccessClient, FlowAPIError
+from NFTminting.image_inbox import ImageInbox
+from NFTminting.mint_ledger import MintLedger
+from NFTminting.minting_service import MINT_BACKEND, MintingService
+from opensea_http import OpenSeaHTTPClient
+from rate_limit import TokenBucket
+from response_cache import ResponseCache
+from sse import format_event
+
+OPENSEA_API_KEY = os.getenv("OPENSEA_API_KEY")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for the whole process instead of one per request
+    app.state.cache = ResponseCache()
+    app.state.opensea = OpenSeaHTTPClient(OPENSEA_API_KEY, cache=app.state.cache)
+    app.state.jobs = JobQueue()
+    await app.state.jobs.start()
+    # Separate pool for arbitrary image/metadata hosts (no OpenSea API key)
+    app.state.downloads = httpx.AsyncClient(timeout=60, follow_redirects=True)
+    # Watched index of NFT_IMAGES_DIR plus minted/unminted ledger
+    app.state.inbox = ImageInbox()
+    await asyncio.to_thread(app.state.inbox.start)
+    app.state.mint_ledger = MintLedger()
+    # Pooled Flow access API client for scripts (and for minting when MINT_BACKEND=rest)
+    app.state.flow = FlowAccessClient(cache=app.state.cache)
+    app.state.minting = MintingService(
+        inbox=app.state.inbox,
+        ledger=app.state.mint_ledger,
+        flow=app.state.flow if MINT_BACKEND == "rest" else None,
+    )
+    await app.state.minting.start()
+    try:
+        yield
+    finally:
+        await app.state.minting.stop()
+        await app.state.flow.aclose()
+        app.state.inbox.stop()
+        await app.state.jobs.stop()
+        await app.state.downloads.aclose()
+        await app.state.opensea.aclose()
+
+
+def get_opensea(request: Request) -> OpenSeaHTTPClient:
+    return request.app.state.opensea
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow CORS for frontend
 app.add_middleware(
@@ -25,75 +83,190 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-OPENSEA_API_KEY = os.getenv("OPENSEA_API_KEY")
-
 @app.get("/")
 def home():
     return {"message": "Backend is running ✅"}
 
 
-@app.get("/nfts/{username}")
-async def get_user_nfts(username: str):
-    headers = {
-        "accept": "application/json",
-        "x-api-key": OPENSEA_API_KEY
-    }
+@app.get("/metrics/http-pool")
+def http_pool_metrics(opensea: OpenSeaHTTPClient = Depends(get_opensea)):
+    return opensea.pool_stats()
 
-    async with httpx.AsyncClient() as client:
-        # Get wallet address
-        account_url = f"https://api.opensea.io/api/v2/accounts/{username}"
-        account_res = await client.get(account_url, headers=headers)
-        account_data = account_res.json()
 
-        wallet_address = account_data.get("address")
-        if not wallet_address:
-            return {"error": "No wallet address found for this username"}
+@app.get("/metrics/cache")
+def cache_metrics(request: Request):
+    return request.app.state.cache.stats()
 
-        # Get NFTs for wallet
-        nfts_url = f"https://api.opensea.io/api/v2/chain/ethereum/account/{wallet_address}/nfts"
-        nfts_res = await client.get(nfts_url, headers=headers)
-        nfts_data = nfts_res.json()
 
-        # Return all raw data to frontend
-        return {
-            "account": account_data,
-            "nfts": nfts_data
+# Chain identifiers accepted by OpenSea's /chain/{chain}/... endpoints
+OPENSEA_API_CHAINS = (
+    "ethereum", "solana", "matic", "base", "arbitrum",
+    "optimism", "avalanche", "klaytn", "zora", "blast",
+)
+CHAIN_FANOUT_LIMIT = int(os.getenv("CHAIN_FANOUT_LIMIT") or 4)
+CHAIN_TIMEOUT = float(os.getenv("CHAIN_TIMEOUT") or 10)
+
+
+def parse_chains(chains: str) -> list:
+    requested = []
+    for chain in chains.split(","):
+        chain = chain.strip().lower()
+        if chain and chain not in requested:
+            requested.append(chain)
+    return requested or ["ethereum"]
+
+
+async def stream_nfts_ndjson(opensea: OpenSeaHTTPClient, header: dict, sources: list):
+    """
+    Yield one NDJSON line per NFT across every page of each OpenSea listing.
+    `sources` is a list of (chain or None, url) walked in order.
+    """
+    yield json.dumps(header) + "\n"
+    count = pages = 0
+    for chain, url in sources:
+        try:
+            async for page in opensea.iter_pages(url):
+                if not isinstance(page, dict) or "nfts" not in page:
+                    # An error body (e.g. a 429) mid-listing: same no-"end" close as below
+                    error = {"type": "error", "chain": chain, "error": page}
+                    yield json.dumps({**error, "count": count, "pages": pages}) + "\n"
+                    return
+                pages += 1
+                for nft in page["nfts"]:
+                    count += 1
+                    line = {"type": "nft", "data": nft}
+                    if chain:
+                        line["chain"] = chain
+                    yield json.dumps(line) + "\n"
+        except (httpx.HTTPError, ValueError) as e:
+            # Headers are long gone; a closing error line (and no "end") tells the
+            # client the list is truncated rather than complete
+            error = {"type": "error", "chain": chain, "error": str(e) or type(e).__name__}
+            yield json.dumps({**error, "count": count, "pages": pages}) + "\n"
+            return
+    yield json.dumps({"type": "end", "count": count, "pages": pages}) + "\n"
+
+
+async def fetch_nfts_across_chains(opensea: OpenSeaHTTPClient, wallet_address: str, chains: list) -> dict:
+    """
+    Query every chain concurrently (bounded by CHAIN_FANOUT_LIMIT, each capped at
+    CHAIN_TIMEOUT seconds) and merge results in completion order, so the total
+    cost is roughly the slowest chain rather than the sum.
+    """
+    semaphore = asyncio.Semaphore(CHAIN_FANOUT_LIMIT)
+
+    async def fetch_chain(chain):
+        async with semaphore:
+            try:
+                data = await asyncio.wait_for(
+                    opensea.get_json(
+                        f"/chain/{chain}/account/{wallet_address}/nfts", resource="nfts"
+                    ),
+                    CHAIN_TIMEOUT,
+                )
+                return chain, data, None
+            except asyncio.TimeoutError:
+                return chain, None, f"timed out after {CHAIN_TIMEOUT}s"
+            except (httpx.HTTPError, ValueError) as e:
+                # ValueError: a non-JSON body (an HTML error page) from this chain
+                return chain, None, str(e) or type(e).__name__
+
+    merged = {"nfts": [], "by_chain": {}, "errors": {}}
+    for next_done in asyncio.as_completed([fetch_chain(c) for c in chains]):
+        chain, data, error = await next_done
+        if error is None and not (isinstance(data, dict) and "nfts" in data):
+            error = data
+        if error is not None:
+            merged["errors"][chain] = error
+            continue
+        # Tag a copy: cached/coalesced payloads are shared between requests
+        merged["nfts"].extend({**nft, "chain": chain} for nft in data["nfts"])
+        merged["by_chain"][chain] = {
+            "count": len(data["nfts"]),
+            "next": data.get("next"),
         }
+    return merged
 
 
-
-@app.get("/collection/{collectionName}")
-async def get_collection_nfts(collectionName: str):
-    headers = {
-        "accept": "application/json",
-        "x-api-key": OPENSEA_API_KEY
+@app.get("/nfts/{username}")
+async def get_user_nfts(
+    username: str,
+    stream: bool = False,
+    chains: str = "ethereum",
+    opensea: OpenSeaHTTPClient = Depends(get_opensea),
+):
+    # Get wallet address
+    account_data = await opensea.get_json(f"/accounts/{username}", resource="account")
+
+    wallet_address = account_data.get("address")
+    if not wallet_address:
+        return {"error": "No wallet address found for this username"}
+
+    requested_chains = parse_chains(chains)
+    unknown = [c for c in requested_chains if c not in OPENSEA_API_CHAINS]
+    if unknown:
+        return {"error": f"Unsupported chain(s): {', '.join(unknown)}"}
+
+    if stream:
+        # Every page, streamed as NDJSON so large wallets are not truncated
+        return StreamingResponse(
+            stream_nfts_ndjson(
+                opensea,
+                {"type": "account", "data": account_data},
+                [
+                    (chain, f"/chain/{chain}/account/{wallet_address}/nfts")
+                    for chain in requested_chains
+                ],
+            ),
+            media_type="application/x-ndjson",
+        )
+
+    if requested_chains == ["ethereum"]:
+        # Get NFTs for wallet
+        nfts_data = await opensea.get_json(
+            f"/chain/ethereum/account/{wallet_address}/nfts", resource="nfts"
+        )
+    else:
+        nfts_data = await fetch_nfts_across_chains(opensea, wallet_address, requested_chains)
+
+    # Return all raw data to frontend
+    return {
+        "account": account_data,
+        "nfts": nfts_data
     }
 
-    async with httpx.AsyncClient() as client:
-        # Get collection details
-        collection_url = f"https://api.opensea.io/api/v2/collection/{collectionName}/nfts"
-        collection_res = await client.get(collection_url, headers=headers)
-        collection_data = collection_res.json()
-
-        # Get NFTs for collection
-        nfts_url = f"https://api.opensea.io/api/v2/collection/{collectionName}/nfts"
-        nfts_res = await client.get(nfts_url, headers=headers)
-        nfts_data = nfts_res.json()
 
-        # Return all raw data to frontend
-        return {
-            "collection": collection_data,
-            "nfts": nfts_data
-        }
-
-        if not wallet_address:
-            return {"error": "No wallet address found for this username"}
 
-        # Return all raw data to frontend
-        return {
-            "account": account_data,
-            "nfts": nfts_data
-        }
+@app.get("/collection/{collectionName}")
+async def get_collection_nfts(
+    collectionName: str,
+    stream: bool = False,
+    opensea: OpenSeaHTTPClient = Depends(get_opensea),
+):
+    if stream:
+        collection_data = await opensea.get_json(
+            f"/collections/{collectionName}", resource="collection"
+        )
+        return StreamingResponse(
+            stream_nfts_ndjson(
+                opensea,
+                {"type": "collection", "data": collection_data},
+                [(None, f"/collection/{collectionName}/nfts")],
+            ),
+            media_type="application/x-ndjson",
+        )
+
+    # Collection details and its NFTs are independent, fetch both at once
+    collection_data, nfts_data = await asyncio.gather(
+        opensea.get_json(f"/collections/{collectionName}", resource="collection"),
+        opensea.get_json(f"/collection/{collectionName}/nfts", resource="nfts"),
+    )
+
+    # Return all raw data to frontend
+    return {
+        "collection": collection_data,
+        "nfts": nfts_data
+    }
 
 
 
@@ -108,62 +281,464 @@ app.add_middleware(
 )
 from fastapi.responses import JSONResponse
 
-@app.post("/api/edit-nft")
+edit_cache = EditCache()
+
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS") or 100)
+BATCH_DOWNLOAD_CONCURRENCY = int(os.getenv("BATCH_DOWNLOAD_CONCURRENCY") or 8)
+BATCH_EDIT_CONCURRENCY = int(os.getenv("BATCH_EDIT_CONCURRENCY") or 3)
+# gpt-image-1 edits per minute allowed for our OpenAI tier
+OPENAI_EDITS_PER_MINUTE = float(os.getenv("OPENAI_EDITS_PER_MINUTE") or 10)
+
+# One OpenAI budget for the whole process: single jobs and every batch share it
+openai_edit_limiter = TokenBucket(OPENAI_EDITS_PER_MINUTE / 60, BATCH_EDIT_CONCURRENCY)
+edit_slots = asyncio.Semaphore(BATCH_EDIT_CONCURRENCY)
+
+
+# edit key -> the running budgeted edit, so duplicates wait outside the budget
+edits_running: Dict[str, asyncio.Future] = {}
+
+
+async def edit_with_budget(key: str, source: bytes, brand: str):
+    """Run the OpenAI edit for key under the shared concurrency/rate budget, unless cached"""
+    if edit_cache.has(key):
+        return
+    task = edits_running.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_budgeted_edit(key, source, brand))
+        edits_running[key] = task
+        task.add_done_callback(lambda _: edits_running.pop(key, None))
+    # shield: one cancelled batch item must not cancel the edit for the others
+    await asyncio.shield(task)
+
+
+async def _budgeted_edit(key: str, source: bytes, brand: str):
+    async with edit_slots:
+        await openai_edit_limiter.acquire()
+        await asyncio.to_thread(
+            edit_cache.get_or_create, key, lambda: edit_image_bytes(source, brand)
+        )
+
+
+async def run_edit_job(file_url: str, brand: str, metadata_url: str = None):
+    """
+    Download + OpenAI edit for one job. The blocking downloads run on threads
+    and the edit waits its turn in the shared OpenAI budget.
+    The edited PNG lives in the edit cache; the job only keeps its key.
+    """
+    metadata = {}
+    if metadata_url:
+        try:
+            meta_resp = await asyncio.to_thread(requests.get, metadata_url, timeout=30)
+            meta_resp.raise_for_status()
+            metadata = meta_resp.json()
+        except Exception as e:
+            print("⚠️ Metadata fetch failed:", e)
+
+    # Seen this URL + brand before: skip the download and the edit entirely
+    key = edit_cache.cached_key_for_url(file_url, brand)
+    if key is None:
+        resp = await asyncio.to_thread(requests.get, file_url, timeout=60)
+        resp.raise_for_status()
+        source = resp.content
+        del resp
+
+        # Download -> edit entirely in memory, no temp files.
+        # Same source bytes + brand + prompt version reuse (or wait for) one edit.
+        key = EditCache.make_key(source, brand, PROMPT_VERSION)
+        await edit_with_budget(key, source, brand)
+        edit_cache.remember_url(file_url, brand, key)
+    return {"edit_key": key, "brand": brand, "metadata": metadata}
+
+
+EDIT_URL_TTL_SECONDS = int(os.getenv("EDIT_URL_TTL_SECONDS") or 300)
+# Per-process secret unless configured, so links die with the server
+EDIT_URL_SECRET = (os.getenv("EDIT_URL_SECRET") or secrets.token_hex(32)).encode()
+
+
+def branded_metadata(metadata: dict, brand: str, image: str = None) -> dict:
+    """Copy of the NFT metadata with the Brand trait appended (and image, if given)"""
+    branded = {k: v for k, v in metadata.items() if k != "image"}
+    branded["attributes"] = list(branded.get("attributes") or []) + [{
+        "trait_type": "Brand",
+        "value": brand
+    }]
+    if image is not None:
+        branded["image"] = image
+    return branded
+
+
+def iter_branded_json(edited: bytes, brand: str, metadata: dict, extra: dict = None,
+                      chunk_size: int = 48 * 1024):
+    """
+    Stream the same JSON the edit endpoint used to return in one blob
+    ({"metadata": {..., "image": "data:..."}} or {"image_base64": "..."}),
+    base64-encoding the image chunk by chunk instead of building one big string.
+    `extra` fields are emitted first.
+    """
+    extra = dict(extra or {})
+    if metadata:
+        head = json.dumps({**extra, "metadata": branded_metadata(metadata, brand)})
+        # Re-open the metadata object (drop the closing "}}") to append the image
+        yield head[:-2] + ', "image": "data:image/png;base64,'
+        tail = '"}}'
+    else:
+        head = json.dumps(extra)[:-1]
+        yield head + (", " if extra else "") + '"image_base64": "'
+        tail = '"}'
+    view = memoryview(edited)
+    # chunk_size is a multiple of 3 so the pieces concatenate into valid base64
+    for start in range(0, len(view), chunk_size):
+        yield base64.b64encode(view[start:start + chunk_size]).decode("ascii")
+    yield tail
+
+
+def signed_edit_url(key: str) -> Tuple[str, int]:
+    expires = int(time.time()) + EDIT_URL_TTL_SECONDS
+    sig = hmac.new(EDIT_URL_SECRET, f"{key}:{expires}".encode(), hashlib.sha256).hexdigest()
+    return f"/api/edited/{key}.png?expires={expires}&sig={sig}", expires
+
+
+def get_jobs(request: Request) -> JobQueue:
+    return request.app.state.jobs
+
+
+@app.post("/api/edit-nft", status_code=202)
 async def edit_nft(
     file_url: str = Form(...),
     brand: str = Form(...),
-    metadata_url: str = Form(None)
+    metadata_url: str = Form(None),
+    jobs: JobQueue = Depends(get_jobs),
 ):
-    temp_file_path = None
+    # Rendering takes tens of seconds: queue it and hand back a job to poll
     try:
-        metadata = {}
-        if metadata_url:
+        job = jobs.submit(
+            "edit-nft", run_edit_job, file_url, brand, metadata_url,
+            dedupe_key=("edit-nft", file_url, brand, metadata_url),
+        )
+    except QueueFull as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "result_url": f"/api/jobs/{job.id}/result",
+        "events_url": f"/api/jobs/{job.id}/events",
+    }
+
+
+
+class BatchEditItem(BaseModel):
+    file_url: str
+    metadata_url: Optional[str] = None
+
+
+class BatchEditRequest(BaseModel):
+    brand: str
+    items: List[BatchEditItem] = Field(..., min_length=1)
+
+
+async def edit_batch_item(
+    item: BatchEditItem,
+    brand: str,
+    downloads: httpx.AsyncClient,
+    download_slots: asyncio.Semaphore,
+) -> Tuple[str, dict]:
+    """Download (concurrently), then edit under the OpenAI concurrency/rate budget"""
+    metadata = {}
+    async with download_slots:
+        if item.metadata_url:
             try:
-                meta_resp = requests.get(metadata_url)
+                meta_resp = await downloads.get(item.metadata_url)
                 meta_resp.raise_for_status()
                 metadata = meta_resp.json()
             except Exception as e:
                 print("⚠️ Metadata fetch failed:", e)
 
-        resp = requests.get(file_url)
-        resp.raise_for_status()
+        key = edit_cache.cached_key_for_url(item.file_url, brand)
+        if key is None:
+            resp = await downloads.get(item.file_url)
+            resp.raise_for_status()
+            source = resp.content
+
+    if key is None:
+        key = EditCache.make_key(source, brand, PROMPT_VERSION)
+        await edit_with_budget(key, source, brand)
+        edit_cache.remember_url(item.file_url, brand, key)
+    return key, metadata
+
+
+@app.post("/api/edit-nft/batch")
+async def edit_nft_batch(payload: BatchEditRequest, request: Request, format: str = "json"):
+    """
+    Apply one brand to many NFTs; streams one NDJSON line per item as it finishes.
+    format=json embeds each image as base64, format=url returns short-lived links.
+    """
+    if len(payload.items) > BATCH_MAX_ITEMS:
+        return JSONResponse(
+            {"error": f"At most {BATCH_MAX_ITEMS} items per batch"}, status_code=413
+        )
+    if format not in ("json", "url"):
+        return JSONResponse({"error": "format must be json or url"}, status_code=400)
+
+    downloads = request.app.state.downloads
+    download_slots = asyncio.Semaphore(BATCH_DOWNLOAD_CONCURRENCY)
+
+    async def run(index, item):
+        try:
+            return index, item, await edit_batch_item(
+                item, payload.brand, downloads, download_slots
+            ), None
+        except Exception as e:
+            print(traceback.format_exc())
+            return index, item, None, str(e)
+
+    async def results():
+        tasks = [asyncio.ensure_future(run(i, item)) for i, item in enumerate(payload.items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, item, done, error = await next_done
+                line = {"index": index, "file_url": item.file_url}
+                edited = None
+                if error is None:
+                    key, metadata = done
+                    if format == "url":
+                        url, expires = signed_edit_url(key)
+                        line.update(status="done", image_url=url, expires_at=expires,
+                                    metadata=branded_metadata(metadata, payload.brand, url))
+                    else:
+                        edited = await asyncio.to_thread(edit_cache.get, key)
+                        if edited is None:
+                            error = "Edited image was evicted before it could be sent"
+                if error is not None:
+                    line.update(status="error", error=error)
+                if edited is None:
+                    yield json.dumps(line) + "\n"
+                    continue
+                for piece in iter_branded_json(edited, payload.brand, metadata,
+                                               extra=dict(line, status="done")):
+                    yield piece
+                yield "\n"
+        finally:
+            # Client went away: stop paying for edits nobody will receive
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@app.get("/api/edited/{key}.png")
+async def edited_image(key: str, expires: int, sig: str):
+    """Short-lived link to an edited image, served straight from the edit cache"""
+    expected = hmac.new(EDIT_URL_SECRET, f"{key}:{expires}".encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, sig) or expires < time.time():
+        return JSONResponse({"error": "Link invalid or expired"}, status_code=403)
+    return await edited_png_response(key)
+
+
+async def edited_png_response(key: str):
+    """The edited PNG from disk, or from memory for edits too big for the cache"""
+    path = edit_cache.path_for(key)
+    if path is not None:
+        return FileResponse(path, media_type="image/png")
+    edited = await asyncio.to_thread(edit_cache.get, key)
+    if edited is None:
+        return JSONResponse({"error": "Edited image no longer available"}, status_code=410)
+    return Response(edited, media_type="image/png")
+
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str, jobs: JobQueue = Depends(get_jobs)):
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Unknown job"}, status_code=404)
+    return {**job.to_dict(), "result_url": f"/api/jobs/{job.id}/result"}
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def job_result(job_id: str, format: str = "json", jobs: JobQueue = Depends(get_jobs)):
+    """
+    Edited image for a finished job:
+      json   - the original {"metadata": ...} / {"image_base64": ...} body, streamed
+      binary - the PNG itself (metadata via format=url)
+      url    - a short-lived link to the PNG plus the branded metadata
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Unknown job"}, status_code=404)
+    if job.status != "done":
+        return JSONResponse(
+            {"error": job.error or "Job not finished", "status": job.status},
+            status_code=409,
+        )
+    if format not in ("json", "binary", "url"):
+        return JSONResponse({"error": "format must be json, binary or url"}, status_code=400)
+
+    key, brand, metadata = job.result["edit_key"], job.result["brand"], job.result["metadata"]
+    if format == "url":
+        url, expires = signed_edit_url(key)
+        return {
+            "image_url": url,
+            "expires_at": expires,
+            "metadata": branded_metadata(metadata, brand, url) if metadata else None,
+        }
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
-            temp_file.write(resp.content)
-            temp_file_path = temp_file.name
+    if format == "binary":
+        return await edited_png_response(key)
 
-        output_path = f"edited_{os.path.basename(temp_file_path)}"
-        edit_image(temp_file_path, brand, output_path)
+    edited = await asyncio.to_thread(edit_cache.get, key)
+    if edited is None:
+        return JSONResponse({"error": "Edited image no longer available"}, status_code=410)
+    return StreamingResponse(
+        iter_branded_json(edited, brand, metadata), media_type="application/json"
+    )
 
-        with open(output_path, "rb") as f:
-            image_base64 = base64.b64encode(f.read()).decode("utf-8")
 
-        if metadata:
-            metadata["image"] = "data:image/png;base64," + image_base64
-            metadata.setdefault("attributes", []).append({
-                "trait_type": "Brand",
-                "value": brand
-            })
-            return {"metadata": metadata}
-        else:
-            return {"image_base64": image_base64}
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str, jobs: JobQueue = Depends(get_jobs)):
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Unknown job"}, status_code=404)
 
-    except Exception as e:
-        print(traceback.format_exc())
-        return {"error": str(e)}
+    async def event_stream():
+        async for update in jobs.watch(job):
+            yield format_event(update.to_dict(), update.status)
 
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        if 'output_path' in locals() and os.path.exists(output_path):
-            os.remove(output_path)
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.get("/metrics/jobs")
+def job_metrics(jobs: JobQueue = Depends(get_jobs)):
+    return {**jobs.stats(), "edit_cache": edit_cache.stats()}
 
 
 
 from fastapi import UploadFile, File
 from fastapi.responses import FileResponse
-from NFTminting.mint import mint_latest  # import from your mint.py
+from NFTminting.mint import NFT_IMAGES_DIR  # import from your mint.py
+
+
+def get_minting(request: Request) -> MintingService:
+    return request.app.state.minting
+
+
+def save_upload(file: UploadFile, inbox: ImageInbox) -> str:
+    os.makedirs(NFT_IMAGES_DIR, exist_ok=True)
+    name = f"{int(time.time())}_{secrets.token_hex(4)}_{os.path.basename(file.filename or 'upload.png')}"
+    path = os.path.join(NFT_IMAGES_DIR, name)
+    # Claim before writing so the inbox watcher never offers it to mint_latest
+    inbox.claim(path)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(file.file, out)
+    return path
+
+
+@app.post("/api/mint-nft", status_code=202)
+async def mint_nft(
+    file: UploadFile = File(None),
+    brand: str = Form(None),
+    name: str = Form(None),
+    description: str = Form(None),
+    minting: MintingService = Depends(get_minting),
+):
+    """
+    Queue a mint of the uploaded image (or the newest one in NFT_IMAGES_DIR)
+    and return a job id right away; poll /api/mint-nft/jobs/{job_id}.
+    """
+    if file is not None:
+        file_path = await asyncio.to_thread(save_upload, file, minting.inbox)
+    else:
+        file_path = minting.inbox.claim_latest()
+    if file_path is None:
+        return JSONResponse({"error": "No unminted images found"}, status_code=404)
+
+    if brand and not name:
+        name = f"{brand} x {os.path.basename(file_path)}"
+    try:
+        job = minting.submit_file(file_path, name, description, brand=brand)
+    except QueueFull as e:
+        minting.inbox.release(file_path)
+        return JSONResponse({"error": str(e)}, status_code=503)
+    return {
+        **job.to_dict(),
+        "file": os.path.basename(file_path),
+        "status_url": f"/api/mint-nft/jobs/{job.id}",
+    }
+
+
+@app.get("/api/mint-nft/jobs/{job_id}")
+def mint_job_status(job_id: str, minting: MintingService = Depends(get_minting)):
+    job = minting.jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Unknown job"}, status_code=404)
+    return job.to_dict()
+
+
+def get_mint_ledger(request: Request) -> MintLedger:
+    return request.app.state.mint_ledger
+
+
+@app.get("/api/mints/{nft_id}")
+def get_mint(nft_id: int, ledger: MintLedger = Depends(get_mint_ledger)):
+    mint = ledger.get(nft_id)
+    if mint is None:
+        return JSONResponse({"error": f"No mint recorded for NFT {nft_id}"}, status_code=404)
+    return mint
+
+
+@app.get("/api/mints")
+def list_mints(
+    brand: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = 50,
+    offset: int = 0,
+    ledger: MintLedger = Depends(get_mint_ledger),
+):
+    """Past mints, newest first; since/until are unix timestamps"""
+    limit, offset = max(1, min(limit, 500)), max(0, offset)
+    mints = ledger.query(brand=brand, since=since, until=until, limit=limit, offset=offset)
+    return {"mints": mints, "limit": limit, "offset": offset}
+
+
+def get_flow(request: Request) -> FlowAccessClient:
+    return request.app.state.flow
+
+
+@app.get("/api/flow/accounts/{address}/nfts")
+async def flow_nft_ids(address: str, flow: FlowAccessClient = Depends(get_flow)):
+    """IDs in an account's MyImageNFTv2 collection (get_ids.cdc)"""
+    try:
+        return {"address": address, "ids": await flow.get_ids(address)}
+    except (FlowAPIError, httpx.HTTPError) as e:
+        return JSONResponse({"error": str(e)}, status_code=502)
+
+
+@app.get("/api/flow/accounts/{address}/collection")
+async def flow_collection(
+    address: str,
+    offset: int = 0,
+    limit: int = 100,
+    flow: FlowAccessClient = Depends(get_flow),
+):
+    """A page of an account's NFTs with metadata, read in bulk instead of per ID"""
+    offset, limit = max(0, offset), max(1, min(limit, 1000))
+    try:
+        return await flow.get_collection_page(address, offset, limit)
+    except (FlowAPIError, httpx.HTTPError) as e:
+        return JSONResponse({"error": str(e)}, status_code=502)
+
+
+@app.get("/api/flow/accounts/{address}/nfts/{nft_id}")
+async def flow_nft_metadata(address: str, nft_id: int, flow: FlowAccessClient = Depends(get_flow)):
+    """On-chain metadata of one NFT (get_NFT_metadata.cdc)"""
+    try:
+        return await flow.get_nft_metadata(address, nft_id)
+    except (FlowAPIError, httpx.HTTPError) as e:
+        return JSONResponse({"error": str(e)}, status_code=502)
+
 
-@app.post("/api/mint-nft")
-async def mint_nft():
-    return mint_latest()
+@app.get("/metrics/mint")
+def mint_metrics(minting: MintingService = Depends(get_minting)):
+    return minting.stats()
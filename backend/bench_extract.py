@@ -0,0 +1,128 @@
+# backend/bench_extract.py
+# Per-payload cost of pulling collection fields out of MCP tool results,
+# before/after collection_fields. Run: python bench_extract.py [payloads.json]
+# (a JSON list of raw tool payloads; defaults to synthetic OpenSea-shaped ones)
+import json
+import sys
+import time
+
+from collection_fields import FIELD_MAPPINGS, PLAN, _extract, extract_collection_info, extract_many
+
+ROUNDS = 7
+
+
+def legacy_extract(data):
+    """extract_collection_info as it was: mappings rebuilt and paths split per call"""
+    if isinstance(data, list) and len(data) > 0:
+        data = data[0]
+    if not isinstance(data, dict):
+        return {}
+
+    info = {}
+    field_mappings = {k: list(v) for k, v in FIELD_MAPPINGS.items()}
+
+    def _get_nested_value(d, field):
+        if "." in field:
+            keys = field.split(".")
+            value = d
+            try:
+                for k in keys:
+                    value = value[k]
+                return value
+            except (KeyError, TypeError):
+                return None
+        return d.get(field)
+
+    for key, possible_fields in field_mappings.items():
+        for field in possible_fields:
+            value = _get_nested_value(data, field)
+            if value is not None:
+                info[key] = value
+                break
+    return info
+
+
+def compiled_only(data):
+    """Precompiled paths, but every candidate probed (no per-shape plan)"""
+    return _extract(data, PLAN)
+
+
+def synthetic_payloads(count=2000):
+    """The three shapes the OpenSea MCP tools return: flat v2 collection, nested collection+stats, search hit list"""
+    payloads = []
+    for i in range(count):
+        slug = f"collection-{i}"
+        flat = {
+            "collection": slug,
+            "name": f"Collection {i}",
+            "description": "A generative collection " * 8,
+            "image_url": f"https://i.seadn.io/{slug}.png",
+            "banner_image_url": f"https://i.seadn.io/{slug}-banner.png",
+            "owner": "0x" + "ab" * 20,
+            "safelist_status": "verified",
+            "category": "pfps",
+            "is_disabled": False,
+            "is_nsfw": False,
+            "opensea_url": f"https://opensea.io/collection/{slug}",
+            "project_url": "",
+            "wiki_url": "",
+            "discord_url": "https://discord.gg/example",
+            "twitter_username": "example",
+            "instagram_username": "",
+            "contracts": [{"address": "0x" + "cd" * 20, "chain": "ethereum"}],
+            "fees": [{"fee": 2.5, "recipient": "0x" + "ef" * 20, "required": True}],
+            "total_supply": 10000,
+            "created_date": "2022-04-22",
+        }
+        nested = {
+            "collection": {k: v for k, v in flat.items() if k != "collection"},
+            "stats": {
+                "total_volume": 1234.5 + i,
+                "num_owners": 5000,
+                "floor_price": 0.42,
+                "sales": 3456,
+                "average_price": 0.6,
+                "market_cap": 4200.0,
+                "one_day_volume": 12.0,
+                "seven_day_volume": 80.0,
+                "thirty_day_volume": 300.0,
+            },
+        }
+        search_hit = [{"name": f"Collection {i}", "slug": slug, "image": flat["image_url"], "floor": 0.42}]
+        payloads.append((flat, nested, search_hit)[i % 3])
+    return payloads
+
+
+def timed(fn, payloads):
+    best = None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        out = fn(payloads)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return out, best
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r", encoding="utf-8") as f:
+            payloads = json.load(f)
+    else:
+        payloads = synthetic_payloads()
+
+    unwrap = lambda d: d[0] if isinstance(d, list) and d else d
+    variants = {
+        "legacy (per-call mappings)": lambda ps: [legacy_extract(p) for p in ps],
+        "compiled paths": lambda ps: [compiled_only(unwrap(p)) for p in ps],
+        "compiled + shape plan": lambda ps: [extract_collection_info(p) for p in ps],
+        "extract_many": extract_many,
+    }
+
+    expected = None
+    print(f"{len(payloads)} payloads, best of {ROUNDS}")
+    for name, fn in variants.items():
+        out, best = timed(fn, payloads)
+        if expected is None:
+            expected = out
+        assert out == expected, f"{name} disagrees with the legacy extractor"
+        print(f"{name:<30}{best / len(payloads) * 1e6:>8.2f} µs/payload")
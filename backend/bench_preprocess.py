@@ -0,0 +1,83 @@
+# backend/bench_preprocess.py
+# Compares upload bytes and prep time for the edit request before/after
+# image_prep.prepare_source. Run: python bench_preprocess.py [image files...]
+import io
+import os
+import sys
+import time
+
+from PIL import Image
+
+from image_prep import prepare_source
+
+# Rough upload estimate; override with UPLOAD_MBIT=...
+UPLOAD_MBIT = float(os.getenv("UPLOAD_MBIT") or 20)
+ROUNDS = 5
+
+
+def old_pipeline(image_bytes: bytes) -> bytes:
+    """What edit_image used to upload: full-size RGBA PNG"""
+    img = Image.open(io.BytesIO(image_bytes)).convert("RGBA")
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def new_pipeline(image_bytes: bytes) -> bytes:
+    return prepare_source(image_bytes)[0]
+
+
+def synthetic_samples():
+    """Typical NFT sources: big PNG art, animated GIF, large JPEG with EXIF"""
+    samples = {}
+
+    art = Image.radial_gradient("L").resize((3000, 3000)).convert("RGB")
+    art = Image.merge("RGB", (art.getchannel(0), art.rotate(90).getchannel(0), art.rotate(45).getchannel(0)))
+    buf = io.BytesIO()
+    art.save(buf, format="PNG")
+    samples["png 3000x3000"] = buf.getvalue()
+
+    frames = [art.resize((800, 800)).rotate(i * 10).convert("P") for i in range(12)]
+    buf = io.BytesIO()
+    frames[0].save(buf, format="GIF", save_all=True, append_images=frames[1:], duration=80)
+    samples["gif 800x800 x12 frames"] = buf.getvalue()
+
+    exif = Image.Exif()
+    exif[0x010E] = "x" * 20000  # ImageDescription padding, as cameras/editors leave behind
+    buf = io.BytesIO()
+    art.resize((4000, 4000)).save(buf, format="JPEG", quality=92, exif=exif)
+    samples["jpeg 4000x4000 + exif"] = buf.getvalue()
+    return samples
+
+
+def timed(fn, data):
+    best = None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        out = fn(data)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return out, best
+
+
+def upload_seconds(size: int) -> float:
+    return size * 8 / (UPLOAD_MBIT * 1_000_000)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        samples = {os.path.basename(p): open(p, "rb").read() for p in sys.argv[1:]}
+    else:
+        samples = synthetic_samples()
+
+    print(f"{'sample':<26}{'source':>10}{'old upload':>12}{'new upload':>12}"
+          f"{'old prep+up':>13}{'new prep+up':>13}")
+    for name, data in samples.items():
+        old_out, old_t = timed(old_pipeline, data)
+        new_out, new_t = timed(new_pipeline, data)
+        print(
+            f"{name:<26}{len(data) / 1e6:>9.2f}M{len(old_out) / 1e6:>11.2f}M{len(new_out) / 1e6:>11.2f}M"
+            f"{(old_t + upload_seconds(len(old_out))) * 1000:>11.0f}ms"
+            f"{(new_t + upload_seconds(len(new_out))) * 1000:>11.0f}ms"
+        )
+    print(f"(prep = best of {ROUNDS}; upload estimated at {UPLOAD_MBIT:g} Mbit/s)")
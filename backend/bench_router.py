@@ -0,0 +1,99 @@
+# backend/bench_router.py
+# How many /chat queries the local intent router answers without the GPT-4
+# routing call, and what routing costs when it does.
+# Run: python bench_router.py [queries.txt]  (one query per line)
+import sys
+import time
+
+from intent_router import IntentRouter
+
+ROUNDS = 200
+
+# Same aliases as NFTCollectionAssistant.collection_mapping
+ALIASES = {
+    "cryptopunks": "cryptopunks",
+    "crypto punks": "cryptopunks",
+    "punks": "cryptopunks",
+    "bored ape": "boredapeyachtclub",
+    "bored ape yacht club": "boredapeyachtclub",
+    "bayc": "boredapeyachtclub",
+    "mutant ape": "mutant-ape-yacht-club",
+    "mayc": "mutant-ape-yacht-club",
+    "azuki": "azuki",
+    "doodles": "doodles-official",
+    "clone x": "clonex",
+    "clonex": "clonex",
+    "pudgy penguins": "pudgypenguins",
+    "pudgy": "pudgypenguins",
+    "art blocks": "art-blocks",
+    "moonbirds": "moonbirds",
+    "otherdeed": "otherdeeds-for-otherside",
+    "world of women": "world-of-women-nft",
+    "cool cats": "cool-cats-nft",
+}
+
+QUERIES = [
+    "floor price of bayc",
+    "What's the floor price of BAYC?",
+    "bayc floor",
+    "how much is a cryptopunk",
+    "crypto punks price",
+    "compare bayc vs mayc",
+    "azuki or doodles, which is better?",
+    "bored ape yacht club stats",
+    "how many owners does pudgy penguins have",
+    "azuky twitter",
+    "doodle discord link",
+    "when did moonbirds launch",
+    "tell me about clone x",
+    "world of women volume",
+    "cool cats market cap",
+    "art blocks sales",
+    "show me popular collections",
+    "top nft collections right now",
+    "otherdeed floor",
+    "mutant ape supply",
+    "how is milady doing",
+    "floor of bayc and milady",
+    "which pfp project has the strongest community",
+    "what should I buy",
+    "is punks worth it vs azuki",
+    "how many blocks in ethereum",
+    "tell me the top otherside lands",
+]
+
+
+def main(queries):
+    router = IntentRouter(ALIASES)
+    fallbacks = []
+    for query in queries:
+        route = router.route(query)
+        label = "llm" if route is None else f"{route.query_type}: {', '.join(route.collections)}"
+        if route is None:
+            fallbacks.append(query)
+        print(f"  {query:<45} -> {label}")
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for query in queries:
+            router._route(query)
+    per_query = (time.perf_counter() - started) / (ROUNDS * len(queries))
+
+    stats = IntentRouter(ALIASES)
+    for query in queries:
+        stats.route(query)
+    summary = stats.stats()
+    print(
+        f"{summary['routed_locally']}/{summary['queries']} routed locally "
+        f"(hit rate {summary['hit_rate']:.0%}), {per_query * 1e6:.1f}µs per query; "
+        f"~{summary['latency_saved_ms'] / 1000:.1f}s of GPT-4 routing saved at "
+        f"{summary['llm_route_ms_avg']:.0f}ms per call"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r", encoding="utf-8") as f:
+            main([line.strip() for line in f if line.strip()])
+    else:
+        main(QUERIES)
@@ -0,0 +1,100 @@
+# backend/bench_sse.py
+# Time-to-result for MCP SSE replies before/after the incremental parser.
+# Replays recorded streams from bench_fixtures/sse through httpx; the server
+# keeps each stream open for TAIL_SECONDS after its last event, as MCP
+# servers do. Run: python bench_sse.py [fixture.sse ...]
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+
+import httpx
+
+from sse import aread_jsonrpc_events, decode_data, iter_events
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures", "sse")
+TAIL_SECONDS = float(os.getenv("TAIL_SECONDS") or 0.5)
+CHUNK = 512
+ROUNDS = 5
+PARSE_ROUNDS = 2000
+
+
+async def legacy_handle_sse_response(response: httpx.Response):
+    """handle_sse_response as it was: buffer every `data: ` line until the stream closes"""
+    events = []
+    async for line in response.aiter_lines():
+        if not line:
+            continue
+        if line.startswith("data: "):
+            try:
+                events.append(json.loads(line[6:]))
+            except json.JSONDecodeError:
+                events.append({"raw": line[6:]})
+    return events
+
+
+def replay(body: bytes):
+    """Transport that streams `body` in chunks, then holds the connection open"""
+    async def stream():
+        for i in range(0, len(body), CHUNK):
+            yield body[i:i + CHUNK]
+            await asyncio.sleep(0)
+        await asyncio.sleep(TAIL_SECONDS)
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=stream())
+
+    return httpx.MockTransport(handler)
+
+
+def response_id(text: str):
+    for event in iter_events(text.splitlines()):
+        message = decode_data(event.data)
+        if isinstance(message, dict) and "result" in message:
+            return message["id"]
+    return None
+
+
+async def time_to_result(body: bytes, handle):
+    async with httpx.AsyncClient(transport=replay(body)) as client:
+        started = time.perf_counter()
+        async with client.stream("POST", "http://mcp.test/mcp") as response:
+            messages = await handle(response)
+        return messages, time.perf_counter() - started
+
+
+async def main(paths):
+    print(f"{'fixture':<24}{'legacy':>10}{'incremental':>13}{'parse':>12}  result found")
+    for path in paths:
+        with open(path, "rb") as f:
+            body = f.read()
+        request_id = response_id(body.decode())
+
+        legacy = new = None
+        for _ in range(ROUNDS):
+            old_messages, t = await time_to_result(body, legacy_handle_sse_response)
+            legacy = t if legacy is None else min(legacy, t)
+            new_messages, t = await time_to_result(
+                body, lambda r: aread_jsonrpc_events(r.aiter_lines(), request_id)
+            )
+            new = t if new is None else min(new, t)
+
+        lines = body.decode().splitlines()
+        started = time.perf_counter()
+        for _ in range(PARSE_ROUNDS):
+            list(iter_events(lines))
+        parse = (time.perf_counter() - started) / PARSE_ROUNDS
+
+        found_old = any(isinstance(m, dict) and m.get("id") == request_id for m in old_messages)
+        found_new = any(isinstance(m, dict) and m.get("id") == request_id for m in new_messages)
+        print(
+            f"{os.path.basename(path):<24}{legacy * 1000:>8.1f}ms{new * 1000:>11.1f}ms"
+            f"{parse * 1e6:>10.1f}µs  legacy={found_old} incremental={found_new}"
+        )
+    print(f"(best of {ROUNDS}; server holds each stream open {TAIL_SECONDS:g}s after the last event)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:] or sorted(glob.glob(os.path.join(FIXTURES, "*.sse")))))
@@ -2,31 +2,65 @@
 
 import os
 import json
+import asyncio
+import itertools
 import time
 import uuid
-import requests
-from typing import Dict, List, Optional
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+import httpx
 from fastapi import FastAPI, Body, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 import dotenv
 
 dotenv.load_dotenv()
 
+from collection_fields import extract_collection_info, extract_many
+from intent_router import IntentRouter
+from rate_limit import TokenBucket
+from response_cache import ResponseCache, is_error_message, make_key
+from sse import aread_jsonrpc_events, format_event
+
 # =========================
 # Config (env-first)
 # =========================
 OPENSEA_MCP_KEY = os.getenv("OPENSEA_MCP_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+MCP_TIMEOUT = float(os.getenv("MCP_TIMEOUT") or 30)
+MCP_MAX_CONNECTIONS = int(os.getenv("MCP_MAX_CONNECTIONS") or 20)
+MCP_TOOLS_REFRESH_SECONDS = float(os.getenv("MCP_TOOLS_REFRESH_SECONDS") or 900)
+# Budget for tools/call requests (the old code slept 0.25s between calls)
+MCP_RATE_PER_SECOND = float(os.getenv("MCP_RATE_PER_SECOND") or 4)
+MCP_RATE_BURST = float(os.getenv("MCP_RATE_BURST") or 4)
+# Seconds /recommendations waits for slug verification before answering
+RECOMMEND_VERIFY_DEADLINE = float(os.getenv("RECOMMEND_VERIFY_DEADLINE") or 5)
+
+# capability -> known tool names (and the argument each expects), in the
+# order the old fallback chain tried them
+TOOL_CANDIDATES = {
+    "collection": [
+        ("get_collection", "slug"),
+        ("get_collection_stats", "collection_slug"),
+        ("collection_stats", "slug"),
+        ("get_collection_info", "collection"),
+    ],
+    "search": [
+        ("search_collections", "query"),
+        ("find_collection", "name"),
+        ("collection_search", "search_term"),
+    ],
+}
 
 # =========================
 # MCP Client
 # =========================
 class OpenSeaMCPClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None):
         self.base_url = "https://mcp.opensea.io/mcp"
         # IMPORTANT: use the provided api_key, do NOT hardcode
         self.headers = {
@@ -34,56 +68,89 @@ class OpenSeaMCPClient:
             "Content-Type": "application/json",
             "Accept": "application/json, text/event-stream",
         }
-        self.request_id = 1
+        # next() on a counter never hands the same id to two concurrent calls
+        self._request_ids = itertools.count(1)
         self.session_id: Optional[str] = None
-        self.initialize_and_setup_session()
-
-    def handle_sse_response(self, response):
-        """Handle Server-Sent Events response"""
-        events = []
-        for line in response.iter_lines(decode_unicode=True):
-            if not line:
-                continue
-            if line.startswith("data: "):
-                try:
-                    data = json.loads(line[6:])
-                    events.append(data)
-                except json.JSONDecodeError:
-                    events.append({"raw": line[6:]})
-        return events
-
-    def send_request(self, method, params=None, use_session_id=True):
+        self.cache = cache or ResponseCache()
+        self.rate_limiter = TokenBucket(MCP_RATE_PER_SECOND, MCP_RATE_BURST)
+        self.client: Optional[httpx.AsyncClient] = None
+        self._init_lock = asyncio.Lock()
+        self._initialized = False
+        # capability -> (tool name, argument name), filled from tools/list
+        self.resolved_tools: Dict[str, tuple] = {}
+        self.tools_refreshed_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.tool_stats = {
+            "direct_calls": 0,
+            "fallback_chain_calls": 0,
+            "fallback_calls_avoided": 0,
+        }
+
+    async def start(self):
+        """Open the pooled connection and the MCP session (once)"""
+        async with self._init_lock:
+            if self.client is None:
+                self.client = httpx.AsyncClient(
+                    headers=self.headers,
+                    timeout=MCP_TIMEOUT,
+                    limits=httpx.Limits(
+                        max_connections=MCP_MAX_CONNECTIONS,
+                        max_keepalive_connections=MCP_MAX_CONNECTIONS,
+                    ),
+                )
+            if not self._initialized:
+                await self.initialize_and_setup_session()
+                self._initialized = True
+                await self.refresh_tools()
+                if self._refresh_task is None:
+                    self._refresh_task = asyncio.ensure_future(self._refresh_tools_forever())
+
+    async def aclose(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self._initialized = False
+
+    async def handle_sse_response(self, response: httpx.Response, request_id=None):
+        """Handle Server-Sent Events response, returning once request_id is answered"""
+        return await aread_jsonrpc_events(response.aiter_lines(), request_id)
+
+    async def send_request(self, method, params=None, use_session_id=True):
         """Send JSON-RPC request"""
+        if self.client is None:
+            await self.start()
+
         payload = {
             "jsonrpc": "2.0",
             "method": method,
-            "id": self.request_id,
+            "id": next(self._request_ids),
         }
         if params:
             payload["params"] = params
 
-        headers = self.headers.copy()
+        headers = {}
         if use_session_id and self.session_id:
             headers["Mcp-Session-Id"] = self.session_id
 
         try:
-            response = requests.post(
-                self.base_url, json=payload, headers=headers, stream=True, timeout=30
-            )
-            self.request_id += 1
-
-            if "Mcp-Session-Id" in response.headers:
-                self.session_id = response.headers["Mcp-Session-Id"]
-
-            content_type = response.headers.get("content-type", "")
-            if "text/event-stream" in content_type:
-                return self.handle_sse_response(response)
-            else:
+            async with self.client.stream(
+                "POST", self.base_url, json=payload, headers=headers
+            ) as response:
+                if "Mcp-Session-Id" in response.headers:
+                    self.session_id = response.headers["Mcp-Session-Id"]
+
+                content_type = response.headers.get("content-type", "")
+                if "text/event-stream" in content_type:
+                    return await self.handle_sse_response(response, payload["id"])
+                await response.aread()
                 return response.json()
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
             return {"error": str(e)}
 
-    def initialize_and_setup_session(self):
+    async def initialize_and_setup_session(self):
         """Initialize connection with proper session handling"""
         if not self.session_id:
             self.session_id = str(uuid.uuid4())
@@ -99,46 +166,126 @@ class OpenSeaMCPClient:
             "clientInfo": {"name": "Python MCP Client", "version": "1.0"},
         }
 
-        result = self.send_request("initialize", params, use_session_id=True)
+        result = await self.send_request("initialize", params, use_session_id=True)
         if isinstance(result, dict) and result.get("error"):
-            result = self.send_request("initialize", params, use_session_id=False)
+            result = await self.send_request("initialize", params, use_session_id=False)
             if not self.session_id:
                 self.session_id = str(uuid.uuid4())
         return result
 
-    def list_available_tools(self):
-        return self.send_request("tools/list")
-
-    def get_collection_data(self, collection_slug: str):
-        """Try multiple tool names for better compatibility"""
-        collection_tools = [
-            ("get_collection", {"slug": collection_slug}),
-            ("get_collection_stats", {"collection_slug": collection_slug}),
-            ("collection_stats", {"slug": collection_slug}),
-            ("get_collection_info", {"collection": collection_slug}),
-        ]
-        for tool_name, args in collection_tools:
-            result = self.send_request(
-                "tools/call", {"name": tool_name, "arguments": args}
+    async def list_available_tools(self):
+        return await self.send_request("tools/list")
+
+    @staticmethod
+    def _tools_from_listing(listing) -> List[Dict]:
+        """Pull the tool definitions out of a JSON or SSE tools/list reply"""
+        replies = listing if isinstance(listing, list) else [listing]
+        for reply in replies:
+            if isinstance(reply, dict):
+                tools = (reply.get("result") or {}).get("tools")
+                if isinstance(tools, list):
+                    return tools
+        return []
+
+    async def refresh_tools(self) -> Dict[str, tuple]:
+        """Resolve each capability to the tool name + argument the server exposes"""
+        tools = self._tools_from_listing(await self.list_available_tools())
+        if not tools:
+            # Keep the previous mapping; dispatch falls back to the chain
+            return self.resolved_tools
+
+        by_name = {t.get("name"): t for t in tools if isinstance(t, dict)}
+        resolved = {}
+        for capability, candidates in TOOL_CANDIDATES.items():
+            for tool_name, arg_name in candidates:
+                tool = by_name.get(tool_name)
+                if tool is None:
+                    continue
+                schema = tool.get("inputSchema") or {}
+                properties = schema.get("properties") or {}
+                required = schema.get("required") or []
+                if properties and arg_name not in properties and len(required) == 1:
+                    # Trust the advertised schema over our guess
+                    arg_name = required[0]
+                resolved[capability] = (tool_name, arg_name)
+                break
+        self.resolved_tools = resolved
+        self.tools_refreshed_at = time.time()
+        return resolved
+
+    async def _refresh_tools_forever(self):
+        while True:
+            await asyncio.sleep(MCP_TOOLS_REFRESH_SECONDS)
+            try:
+                await self.refresh_tools()
+            except Exception as e:
+                print(f"⚠️ MCP tool refresh failed: {e}")
+
+    async def call_capability(self, capability: str, value: str, not_found: str):
+        """Call the resolved tool directly, or walk the candidate chain if unresolved"""
+        candidates = TOOL_CANDIDATES[capability]
+        resolved = self.resolved_tools.get(capability)
+        if resolved is not None:
+            tool_name, arg_name = resolved
+            self.tool_stats["direct_calls"] += 1
+            self.tool_stats["fallback_calls_avoided"] += next(
+                (i for i, (name, _) in enumerate(candidates) if name == tool_name),
+                0,
             )
-            # If not an error dict, return it
-            if not (isinstance(result, dict) and result.get("error")):
-                return result
-        return {"error": "No data available"}
-
-    def search_collections(self, query: str):
-        search_tools = [
-            ("search_collections", {"query": query}),
-            ("find_collection", {"name": query}),
-            ("collection_search", {"search_term": query}),
-        ]
-        for tool_name, args in search_tools:
-            result = self.send_request(
-                "tools/call", {"name": tool_name, "arguments": args}
+            await self.rate_limiter.acquire()
+            return await self.send_request(
+                "tools/call", {"name": tool_name, "arguments": {arg_name: value}}
+            )
+
+        for tool_name, arg_name in candidates:
+            self.tool_stats["fallback_chain_calls"] += 1
+            await self.rate_limiter.acquire()
+            result = await self.send_request(
+                "tools/call", {"name": tool_name, "arguments": {arg_name: value}}
             )
+            # If not an error dict, return it
             if not (isinstance(result, dict) and result.get("error")):
                 return result
-        return {"error": "Search not available"}
+        return {"error": not_found}
+
+    def tool_metrics(self) -> Dict:
+        return {
+            "resolved": {
+                cap: {"tool": name, "argument": arg}
+                for cap, (name, arg) in self.resolved_tools.items()
+            },
+            "refreshed_at": self.tools_refreshed_at,
+            "refresh_interval_seconds": MCP_TOOLS_REFRESH_SECONDS,
+            "rate_limiter": self.rate_limiter.stats(),
+            **self.tool_stats,
+        }
+
+    async def get_collection_data(self, collection_slug: str):
+        """Collection data, served from the response cache when warm"""
+        return await self.cache.get_or_fetch(
+            "collection",
+            make_key("mcp:get_collection_data", collection_slug),
+            lambda: self.call_capability("collection", collection_slug, "No data available"),
+        )
+
+    @staticmethod
+    def is_error_result(result) -> bool:
+        """Error dicts, JSON-RPC errors and MCP tool errors (isError) all count"""
+        replies = result if isinstance(result, list) else [result]
+        if not replies:
+            return True
+        # One error event (next to progress notifications) fails the whole reply
+        return any(is_error_message(reply) for reply in replies)
+
+    async def collection_exists(self, collection_slug: str) -> bool:
+        """
+        Existence check through the same cache entry as get_collection_data,
+        so verifying a slug also warms the data a follow-up request will need
+        """
+        return not self.is_error_result(await self.get_collection_data(collection_slug))
+
+    async def search_collections(self, query: str):
+        return await self.call_capability("search", query, "Search not available")
 
 
 # =========================
@@ -147,7 +294,7 @@ class OpenSeaMCPClient:
 class NFTCollectionAssistant:
     def __init__(self, opensea_api_key: str, openai_api_key: str):
         self.mcp_client = OpenSeaMCPClient(opensea_api_key)
-        self.openai_client = OpenAI(api_key=openai_api_key)
+        self.openai_client = AsyncOpenAI(api_key=openai_api_key)
 
         self.collection_mapping = {
             "cryptopunks": "cryptopunks",
@@ -170,99 +317,18 @@ class NFTCollectionAssistant:
             "world of women": "world-of-women-nft",
             "cool cats": "cool-cats-nft",
         }
+        self.router = IntentRouter(self.collection_mapping)
 
     def extract_collection_info(self, data) -> Dict:
         """Extract useful fields from possibly varied tool outputs"""
-        if isinstance(data, list) and len(data) > 0:
-            data = data[0]
-        if not isinstance(data, dict):
-            return {}
-
-        info = {}
-        field_mappings = {
-            "name": ["name", "collection.name", "title"],
-            "description": ["description", "collection.description", "desc"],
-            "floor_price": [
-                "floor_price",
-                "floorPrice",
-                "floor",
-                "stats.floor_price",
-                "collection.floor_price",
-            ],
-            "total_supply": [
-                "total_supply",
-                "totalSupply",
-                "supply",
-                "stats.total_supply",
-                "collection.total_supply",
-            ],
-            "owners": [
-                "owners",
-                "num_owners",
-                "stats.num_owners",
-                "collection.owners",
-            ],
-            "volume": [
-                "total_volume",
-                "volume",
-                "stats.total_volume",
-                "collection.total_volume",
-            ],
-            "created_date": [
-                "created_date",
-                "createdDate",
-                "created",
-                "collection.created_date",
-            ],
-            "website": ["external_url", "website", "collection.external_url"],
-            "discord": ["discord_url", "discord", "collection.discord_url"],
-            "twitter": ["twitter_username", "twitter", "collection.twitter_username"],
-            "instagram": [
-                "instagram_username",
-                "instagram",
-                "collection.instagram_username",
-            ],
-            "wiki": ["wiki_url", "wiki", "collection.wiki_url"],
-            "banner_image": [
-                "banner_image_url",
-                "banner",
-                "collection.banner_image_url",
-            ],
-            "featured_image": [
-                "featured_image_url",
-                "image",
-                "collection.featured_image_url",
-            ],
-            "sales": ["sales", "num_sales", "stats.sales", "stats.num_sales"],
-            "average_price": ["average_price", "avg_price", "stats.average_price"],
-            "market_cap": ["market_cap", "marketCap", "stats.market_cap"],
-            "one_day_volume": ["one_day_volume", "stats.one_day_volume"],
-            "seven_day_volume": ["seven_day_volume", "stats.seven_day_volume"],
-            "thirty_day_volume": ["thirty_day_volume", "stats.thirty_day_volume"],
-        }
+        return extract_collection_info(data)
+
+    async def route_query(self, user_query: str):
+        """(slugs, user_intent, query_type); the local router first, the LLM when it's unsure"""
+        route = self.router.route(user_query)
+        if route is not None:
+            return route.collections, route.user_intent, route.query_type
 
-        def _get_nested_value(d, field):
-            if "." in field:
-                keys = field.split(".")
-                value = d
-                try:
-                    for k in keys:
-                        value = value[k]
-                    return value
-                except (KeyError, TypeError):
-                    return None
-            return d.get(field)
-
-        for key, possible_fields in field_mappings.items():
-            for field in possible_fields:
-                value = _get_nested_value(data, field)
-                if value is not None:
-                    info[key] = value
-                    break
-
-        return info
-
-    def get_nft_collection_info(self, user_query: str) -> str:
         system_prompt = f"""
 You are a comprehensive NFT collection assistant that helps users get detailed information about NFT collections.
 
@@ -286,47 +352,74 @@ Return format:
 
 User query: "{user_query}"
 """
+        started = time.perf_counter()
+        response = await self.openai_client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_query},
+            ],
+            temperature=0.1,
+        )
+        self.router.record_llm(time.perf_counter() - started)
+        ai_response = response.choices[0].message.content
+
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_query},
-                ],
-                temperature=0.1,
+            parsed = json.loads(ai_response)
+            return (
+                parsed.get("collections", []),
+                parsed.get("user_intent", "Get NFT collection information"),
+                parsed.get("query_type", "general"),
+            )
+        except json.JSONDecodeError:
+            return (
+                ["cryptopunks", "boredapeyachtclub", "azuki"],
+                "Get popular NFT collection information",
+                "general",
             )
-            ai_response = response.choices[0].message.content
 
-            try:
-                parsed = json.loads(ai_response)
-                collections_to_fetch = parsed.get("collections", [])
-                user_intent = parsed.get("user_intent", "Get NFT collection information")
-                query_type = parsed.get("query_type", "general")
-            except json.JSONDecodeError:
-                collections_to_fetch = ["cryptopunks", "boredapeyachtclub", "azuki"]
-                user_intent = "Get popular NFT collection information"
-                query_type = "general"
+    async def stream_collection_info(self, user_query: str) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        /chat as (event, data) pairs: status updates while routing and
+        fetching, then the analysis completion token by token, then "done"
+        with the full answer (or "error").
+        """
+        started = time.perf_counter()
+        tasks: Dict[asyncio.Task, str] = {}
+        try:
+            yield "status", {"stage": "routing", "message": "Reading your question…"}
+            collections_to_fetch, user_intent, query_type = await self.route_query(user_query)
+            yield "status", {
+                "stage": "routed",
+                "collections": collections_to_fetch,
+                "query_type": query_type,
+            }
 
-            collection_data = []
+            # One task per slug; the client's token bucket paces the upstream calls
             for slug in collections_to_fetch:
-                raw = self.mcp_client.get_collection_data(slug)
-                processed = self.extract_collection_info(raw)
+                tasks[asyncio.ensure_future(self.mcp_client.get_collection_data(slug))] = slug
+                yield "status", {"stage": "fetching", "slug": slug, "message": f"Fetching {slug}…"}
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield "status", {"stage": "fetched", "slug": tasks[task]}
+            raws = [task.result() for task in tasks]
 
-                # Display name from mapping
-                display_name = slug
-                for name, mapped in self.collection_mapping.items():
-                    if mapped == slug:
-                        display_name = name.title()
-                        break
+            collection_data = []
+            for slug, processed in zip(collections_to_fetch, extract_many(raws)):
 
-                processed["display_name"] = display_name
+                # Display name from mapping
+                processed["display_name"] = self.router.display_names.get(slug, slug)
                 processed["slug"] = slug
                 collection_data.append(processed)
-                time.sleep(0.25)
 
-            if collection_data:
-                data_summary = json.dumps(collection_data, indent=2, default=str)
-                format_prompt = f"""
+            if not collection_data:
+                yield "done", {"answer": "I couldn't fetch data for the requested collections."}
+                return
+
+            data_summary = json.dumps(collection_data, indent=2, default=str)
+            format_prompt = f"""
 Based on the user's original query: "{user_query}"
 Query type: {query_type}
 User intent: {user_intent}
@@ -340,29 +433,61 @@ Provide a detailed, informative response that:
 3) Includes specific stats when available
 4) Acknowledges missing data if any
 """
-                out = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a knowledgeable NFT collection analyst.",
-                        },
-                        {"role": "user", "content": format_prompt},
-                    ],
-                    temperature=0.3,
-                    max_tokens=120,
-                )
-                return out.choices[0].message.content
-
-            return "I couldn't fetch data for the requested collections."
+            yield "status", {"stage": "analyzing", "message": "Writing the answer…"}
+            stream = await self.openai_client.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a knowledgeable NFT collection analyst.",
+                    },
+                    {"role": "user", "content": format_prompt},
+                ],
+                temperature=0.3,
+                max_tokens=120,
+                stream=True,
+            )
+            parts: List[str] = []
+            first_token_ms = None
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = round((time.perf_counter() - started) * 1000, 1)
+                parts.append(delta)
+                yield "token", {"delta": delta}
+
+            yield "done", {
+                "answer": "".join(parts),
+                "first_token_ms": first_token_ms,
+                "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
         except Exception as e:
-            return f"Error while fetching NFT collection info: {str(e)}"
-
-    def recommend_collections_for_brand(self, brand_name: str) -> Dict:
+            yield "error", {"error": f"Error while fetching NFT collection info: {str(e)}"}
+        finally:
+            # Client went away mid-stream: don't leave fetches running for nobody
+            for task in tasks:
+                task.cancel()
+
+    async def get_nft_collection_info(self, user_query: str) -> str:
+        async with aclosing(self.stream_collection_info(user_query)) as events:
+            async for event, data in events:
+                if event == "done":
+                    return data["answer"]
+                if event == "error":
+                    return data["error"]
+        return "I couldn't fetch data for the requested collections."
+
+    async def stream_recommendations(
+        self, brand_name: str, deadline: float = RECOMMEND_VERIFY_DEADLINE
+    ) -> AsyncIterator[Tuple[str, Dict]]:
         """
         Simple LLM-driven recommender:
         - Map brand tone/industry to 3–5 likely collections (by slug)
         - Try resolving via MCP search if needed
+        Yields the picks as soon as the LLM answers, then one "verified"
+        event per slug check, then "done" with the full result.
         """
         seed_slugs = list(
             {v for v in self.collection_mapping.values()}
@@ -378,9 +503,11 @@ Return a compact JSON object:
 Valid slugs to consider (not exhaustive):
 {json.dumps(seed_slugs, indent=2)}
 """
+        checks: Dict[asyncio.Task, str] = {}
         try:
+            yield "status", {"stage": "recommending", "message": f"Finding collections for {brand_name}…"}
             prompt = f'Brand name: "{brand_name}"'
-            resp = self.openai_client.chat.completions.create(
+            resp = await self.openai_client.chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": sys},
@@ -393,23 +520,59 @@ Valid slugs to consider (not exhaustive):
                 parsed = json.loads(content)
             except json.JSONDecodeError:
                 parsed = {"recommendations": ["cryptopunks", "boredapeyachtclub", "azuki"], "rationale": "Popular, high-awareness collections with broad cultural fit."}
+            yield "recommendations", {
+                "recommendations": parsed.get("recommendations", []),
+                "rationale": parsed.get("rationale", ""),
+            }
 
-            # Optionally verify each recommended slug by attempting to fetch data
-            verified = []
-            for slug in parsed.get("recommendations", [])[:5]:
-                data = self.mcp_client.get_collection_data(slug)
-                if not (isinstance(data, dict) and data.get("error")):
-                    verified.append(slug)
-                time.sleep(0.2)
-
-            parsed["verified"] = verified
-            return parsed
+            # Verify recommended slugs concurrently; whatever is still running at
+            # the deadline is reported as unverified rather than holding the reply
+            candidates = parsed.get("recommendations", [])[:5]
+            checks = {
+                asyncio.ensure_future(self.mcp_client.collection_exists(slug)): slug
+                for slug in candidates
+            }
+            yield "status", {"stage": "verifying", "slugs": candidates}
+            loop = asyncio.get_running_loop()
+            ends_at = loop.time() + deadline
+            confirmed = set()
+            pending = set(checks)
+            while pending and loop.time() < ends_at:
+                done, pending = await asyncio.wait(
+                    pending, timeout=ends_at - loop.time(), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    ok = not task.cancelled() and task.exception() is None and bool(task.result())
+                    if ok:
+                        confirmed.add(checks[task])
+                    yield "verified", {"slug": checks[task], "verified": ok}
+
+            for task in pending:
+                task.cancel()
+
+            parsed["verified"] = [slug for slug in candidates if slug in confirmed]
+            parsed["unverified"] = [slug for task, slug in checks.items() if task in pending]
+            yield "done", parsed
         except Exception as e:
-            return {
+            yield "done", {
                 "recommendations": ["cryptopunks", "boredapeyachtclub", "azuki"],
                 "rationale": f"Fallback due to error: {str(e)}",
                 "verified": [],
+                "unverified": [],
             }
+        finally:
+            for task in checks:
+                task.cancel()
+
+    async def recommend_collections_for_brand(
+        self, brand_name: str, deadline: float = RECOMMEND_VERIFY_DEADLINE
+    ) -> Dict:
+        result: Dict = {}
+        async with aclosing(self.stream_recommendations(brand_name, deadline)) as events:
+            async for event, data in events:
+                if event == "done":
+                    result = data
+        return result
 
 
 # =========================
@@ -417,7 +580,18 @@ Valid slugs to consider (not exhaustive):
 # =========================
 assistant = NFTCollectionAssistant(OPENSEA_MCP_KEY, OPENAI_API_KEY)
 
-app = FastAPI(title="NFT Brand Customizer Backend", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One MCP session and connection pool for the lifetime of the server
+    await assistant.mcp_client.start()
+    try:
+        yield
+    finally:
+        await assistant.mcp_client.aclose()
+
+
+app = FastAPI(title="NFT Brand Customizer Backend", version="1.0.0", lifespan=lifespan)
 
 # CORS for local dev frontends
 app.add_middleware(
@@ -451,6 +625,9 @@ class RecommendationResponse(BaseModel):
     recommendations: List[str]
     rationale: str
     verified: List[str]
+    unverified: List[str] = Field(
+        default_factory=list, description="Slugs whose check missed the deadline"
+    )
 
 @app.get("/")
 def root():
@@ -461,46 +638,90 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics/cache")
+def cache_metrics():
+    return assistant.mcp_client.cache.stats()
+
+
+@app.get("/metrics/mcp")
+def mcp_metrics():
+    return assistant.mcp_client.tool_metrics()
+
+
+@app.get("/metrics/router")
+def router_metrics():
+    return assistant.router.stats()
+
+
 @app.get("/tools")
-def tools():
-    res = assistant.mcp_client.list_available_tools()
+async def tools():
+    res = await assistant.mcp_client.list_available_tools()
     if isinstance(res, dict) and res.get("error"):
         raise HTTPException(status_code=502, detail=res)
     return res
 
 
 @app.get("/collection/{slug}")
-def collection(slug: str):
-    res = assistant.mcp_client.get_collection_data(slug)
+async def collection(slug: str):
+    res = await assistant.mcp_client.get_collection_data(slug)
     if isinstance(res, dict) and res.get("error"):
         raise HTTPException(status_code=404, detail=res)
     return res
 
 
 @app.get("/search")
-def search(q: str = Query(..., description="Search term for collections")):
-    res = assistant.mcp_client.search_collections(q)
+async def search(q: str = Query(..., description="Search term for collections")):
+    res = await assistant.mcp_client.search_collections(q)
     if isinstance(res, dict) and res.get("error"):
         raise HTTPException(status_code=502, detail=res)
     return res
 
 
 @app.post("/chat", response_model=ChatResponse)
-def chat(payload: ChatRequest):
-    answer = assistant.get_nft_collection_info(payload.query)
+async def chat(payload: ChatRequest):
+    answer = await assistant.get_nft_collection_info(payload.query)
     return ChatResponse(answer=answer)
 
 
+def event_stream(events: AsyncIterator[Tuple[str, Dict]]) -> StreamingResponse:
+    """(event, data) pairs as text/event-stream, flushed frame by frame"""
+
+    async def body():
+        async with aclosing(events) as stream:
+            async for event, data in stream:
+                yield format_event(data, event)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # no-transform / X-Accel-Buffering keep proxies from holding frames back
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/chat/stream")
+async def chat_stream(payload: ChatRequest):
+    """/chat as SSE: status events, then the answer token by token, then done"""
+    return event_stream(assistant.stream_collection_info(payload.query))
+
+
 @app.post("/recommendations", response_model=RecommendationResponse)
-def recommendations(payload: RecommendationRequest):
-    rec = assistant.recommend_collections_for_brand(payload.brand_name)
+async def recommendations(payload: RecommendationRequest):
+    rec = await assistant.recommend_collections_for_brand(payload.brand_name)
     return RecommendationResponse(
         recommendations=rec.get("recommendations", []),
         rationale=rec.get("rationale", ""),
         verified=rec.get("verified", []),
+        unverified=rec.get("unverified", []),
     )
 
 
+@app.post("/recommendations/stream")
+async def recommendations_stream(payload: RecommendationRequest):
+    """/recommendations as SSE: picks as soon as the LLM answers, then each slug check"""
+    return event_stream(assistant.stream_recommendations(payload.brand_name))
+
+
 # Run with: uvicorn server:app --host 0.0.0.0 --port 8002 --reload
 if __name__ == "__main__":
     import uvicorn
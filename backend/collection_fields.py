@@ -0,0 +1,148 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# output field -> candidate paths in the tool payload, first non-None wins
+FIELD_MAPPINGS: Dict[str, List[str]] = {
+    "name": ["name", "collection.name", "title"],
+    "description": ["description", "collection.description", "desc"],
+    "floor_price": [
+        "floor_price",
+        "floorPrice",
+        "floor",
+        "stats.floor_price",
+        "collection.floor_price",
+    ],
+    "total_supply": [
+        "total_supply",
+        "totalSupply",
+        "supply",
+        "stats.total_supply",
+        "collection.total_supply",
+    ],
+    "owners": [
+        "owners",
+        "num_owners",
+        "stats.num_owners",
+        "collection.owners",
+    ],
+    "volume": [
+        "total_volume",
+        "volume",
+        "stats.total_volume",
+        "collection.total_volume",
+    ],
+    "created_date": [
+        "created_date",
+        "createdDate",
+        "created",
+        "collection.created_date",
+    ],
+    "website": ["external_url", "website", "collection.external_url"],
+    "discord": ["discord_url", "discord", "collection.discord_url"],
+    "twitter": ["twitter_username", "twitter", "collection.twitter_username"],
+    "instagram": [
+        "instagram_username",
+        "instagram",
+        "collection.instagram_username",
+    ],
+    "wiki": ["wiki_url", "wiki", "collection.wiki_url"],
+    "banner_image": [
+        "banner_image_url",
+        "banner",
+        "collection.banner_image_url",
+    ],
+    "featured_image": [
+        "featured_image_url",
+        "image",
+        "collection.featured_image_url",
+    ],
+    "sales": ["sales", "num_sales", "stats.sales", "stats.num_sales"],
+    "average_price": ["average_price", "avg_price", "stats.average_price"],
+    "market_cap": ["market_cap", "marketCap", "stats.market_cap"],
+    "one_day_volume": ["one_day_volume", "stats.one_day_volume"],
+    "seven_day_volume": ["seven_day_volume", "stats.seven_day_volume"],
+    "thirty_day_volume": ["thirty_day_volume", "stats.thirty_day_volume"],
+}
+
+# (output field, ((first key, rest of path or None), ...)) with paths split once
+Plan = Tuple[Tuple[str, Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...]], ...]
+
+
+def compile_mappings(mappings: Dict[str, List[str]]) -> Plan:
+    return tuple(
+        (
+            field,
+            tuple(
+                (path.split(".")[0], tuple(path.split(".")[1:]) or None)
+                for path in paths
+            ),
+        )
+        for field, paths in mappings.items()
+    )
+
+
+PLAN = compile_mappings(FIELD_MAPPINGS)
+
+
+@lru_cache(maxsize=256)
+def _plan_for(keys: frozenset) -> Plan:
+    """
+    PLAN without the candidates whose first key is absent. Tool payloads
+    come in a handful of shapes, so this is computed once per shape and
+    most candidates never get probed.
+    """
+    return tuple(
+        (field, live)
+        for field, candidates in PLAN
+        if (live := tuple(c for c in candidates if c[0] in keys))
+    )
+
+
+def _walk(value: Any, rest: Tuple[str, ...]) -> Any:
+    try:
+        for key in rest:
+            value = value[key]
+        return value
+    except (KeyError, TypeError, IndexError):
+        return None
+
+
+def _extract(data: Dict, plan: Plan) -> Dict:
+    info = {}
+    get = data.get
+    for field, candidates in plan:
+        for first, rest in candidates:
+            value = get(first)
+            if rest is not None and value is not None:
+                value = _walk(value, rest)
+            if value is not None:
+                info[field] = value
+                break
+    return info
+
+
+def extract_collection_info(data: Any) -> Dict:
+    """Useful fields from one (possibly list-wrapped) collection payload"""
+    if isinstance(data, list) and len(data) > 0:
+        data = data[0]
+    if not isinstance(data, dict):
+        return {}
+    return _extract(data, _plan_for(frozenset(data)))
+
+
+def extract_many(payloads: Iterable[Any]) -> List[Dict]:
+    """extract_collection_info over many payloads, sharing one plan per payload shape"""
+    out = []
+    plans: Dict[frozenset, Plan] = {}
+    for data in payloads:
+        if isinstance(data, list) and len(data) > 0:
+            data = data[0]
+        if not isinstance(data, dict):
+            out.append({})
+            continue
+        keys = frozenset(data)
+        plan = plans.get(keys)
+        if plan is None:
+            plan = plans[keys] = _plan_for(keys)
+        out.append(_extract(data, plan))
+    return out
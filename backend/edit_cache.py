@@ -0,0 +1,198 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+# =========================
+# Config (env-first)
+# =========================
+EDIT_CACHE_DIR = os.getenv("EDIT_CACHE_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "edit_cache"
+)
+EDIT_CACHE_MAX_BYTES = int(os.getenv("EDIT_CACHE_MAX_BYTES") or 512 * 1024 * 1024)
+# How many (file_url, brand) -> content hash aliases to remember
+EDIT_CACHE_URL_ALIASES = 10000
+# How long an alias is trusted before the URL is downloaded and hashed again;
+# the image behind a URL can change, and the alias never sees its bytes
+EDIT_CACHE_URL_TTL = float(os.getenv("EDIT_CACHE_URL_TTL") or 300)
+# Edits larger than the whole disk budget stay in memory (newest few only) so
+# the job that paid for them, and anyone waiting on it, can still be served
+EDIT_CACHE_OVERSIZE_ENTRIES = 4
+
+
+class EditCache:
+    """
+    Content-addressed store for branded edits on local disk.
+    Key = sha256(source image bytes + brand + prompt version); eviction is LRU
+    by total bytes. Concurrent requests for the same key wait for the first
+    one instead of paying for a second OpenAI edit.
+    """
+
+    def __init__(self, directory: str = EDIT_CACHE_DIR, max_bytes: int = EDIT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # key -> size, oldest first; rebuilt from disk so the cache survives restarts
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self.current_bytes = 0
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(".png"):
+                path = os.path.join(directory, name)
+                entries.append((os.path.getmtime(path), name[:-4], os.path.getsize(path)))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.current_bytes += size
+        # (file_url, brand) -> (key, expires_at)
+        self._url_aliases: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._oversize: "OrderedDict[str, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.waited = 0
+        self.evictions = 0
+        self.oversize = 0
+
+    @staticmethod
+    def make_key(source: bytes, brand: str, prompt_version: str) -> str:
+        h = hashlib.sha256()
+        h.update(source)
+        h.update(b"\0" + brand.strip().lower().encode("utf-8"))
+        h.update(b"\0" + prompt_version.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._oversize:
+                return self._oversize[key]
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.current_bytes -= self._index.pop(key, 0)
+            return None
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            # Evicted between the read and the touch; the bytes are still good
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            print(f"⚠️ Edit {key[:12]} is {len(data)} bytes, over the cache budget; kept in memory only")
+            with self._lock:
+                self.oversize += 1
+                self._oversize[key] = data
+                while len(self._oversize) > EDIT_CACHE_OVERSIZE_ENTRIES:
+                    self._oversize.popitem(last=False)
+            return
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        with self._lock:
+            self.current_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self.current_bytes += len(data)
+            while self.current_bytes > self.max_bytes:
+                oldest, size = self._index.popitem(last=False)
+                self.current_bytes -= size
+                self.evictions += 1
+                try:
+                    os.remove(self._path(oldest))
+                except FileNotFoundError:
+                    pass
+
+    def remember_url(self, file_url: str, brand: str, key: str):
+        with self._lock:
+            self._url_aliases[(file_url, brand)] = (key, time.monotonic() + EDIT_CACHE_URL_TTL)
+            self._url_aliases.move_to_end((file_url, brand))
+            while len(self._url_aliases) > EDIT_CACHE_URL_ALIASES:
+                self._url_aliases.popitem(last=False)
+
+    def cached_key_for_url(self, file_url: str, brand: str) -> Optional[str]:
+        """Key of a stored edit for a URL seen before, so the source need not be re-downloaded"""
+        with self._lock:
+            alias = self._url_aliases.get((file_url, brand))
+            if alias is None:
+                return None
+            key, expires_at = alias
+            if time.monotonic() >= expires_at:
+                del self._url_aliases[(file_url, brand)]
+                return None
+            if key not in self._index and key not in self._oversize:
+                return None
+            if key in self._index:
+                self._index.move_to_end(key)
+        self.hits += 1
+        return key
+
+    def path_for(self, key: str) -> Optional[str]:
+        """On-disk location of a stored edit, or None if it is not (or no longer) cached"""
+        with self._lock:
+            if key not in self._index:
+                return None
+        path = self._path(key)
+        return path if os.path.exists(path) else None
+
+    def has(self, key: str) -> bool:
+        """Whether get(key) would find the edit, on disk or held in memory"""
+        with self._lock:
+            if key in self._oversize:
+                return True
+        return self.path_for(key) is not None
+
+    def get_or_create(self, key: str, create: Callable[[], bytes]) -> bytes:
+        """Cached bytes, or create() once while duplicates wait for it"""
+        while True:
+            data = self.get(key)
+            if data is not None:
+                self.hits += 1
+                return data
+            with self._lock:
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = self._in_flight[key] = threading.Event()
+                    leader = True
+                else:
+                    leader = False
+            if not leader:
+                self.waited += 1
+                event.wait()
+                # Leader stored the result (or failed, in which case we retry)
+                continue
+
+            try:
+                self.misses += 1
+                data = create()
+                self.put(key, data)
+                return data
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+                event.set()
+
+    def stats(self) -> Dict:
+        return {
+            "directory": self.directory,
+            "entries": len(self._index),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "waited_on_in_flight": self.waited,
+            "evictions": self.evictions,
+            "oversize_in_memory": self.oversize,
+            "in_flight": len(self._in_flight),
+        }
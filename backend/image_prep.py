@@ -0,0 +1,33 @@
+import io
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+# gpt-image-1 edits are requested at 1024x1024, anything bigger is wasted upload
+EDIT_TARGET_SIZE = 1024
+
+
+def prepare_source(image_bytes: bytes, target: int = EDIT_TARGET_SIZE) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    Decode once and normalize an NFT image for the edit upload:
+    first frame of animations, EXIF orientation applied, palette/greyscale/CMYK
+    converted to RGBA, downsampled to fit `target` and re-encoded as a PNG
+    without metadata. Returns (png bytes, size).
+    """
+    with Image.open(io.BytesIO(image_bytes)) as src:
+        if getattr(src, "is_animated", False):
+            src.seek(0)
+        if src.format == "JPEG":
+            # Let libjpeg decode at a reduced scale (DCT scaling) when it can
+            src.draft("RGB", (target, target))
+        img = ImageOps.exif_transpose(src)
+        img = img.convert("RGBA")
+
+    if max(img.size) > target:
+        # reduce() by an integer factor first, then a cheap bilinear pass
+        img.thumbnail((target, target), Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+    out = io.BytesIO()
+    # A fresh save carries no EXIF/text chunks from the original
+    img.save(out, format="PNG", compress_level=6)
+    return out.getvalue(), img.size
@@ -0,0 +1,221 @@
+import difflib
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# =========================
+# Config (env-first)
+# =========================
+# "0" sends every query to the LLM (metrics still count them as fallbacks)
+INTENT_ROUTER_ENABLED = (os.getenv("INTENT_ROUTER_ENABLED") or "1") != "0"
+# difflib ratio a misspelt alias needs to count as a match ("azuky" -> "azuki")
+INTENT_FUZZY_CUTOFF = float(os.getenv("INTENT_FUZZY_CUTOFF") or 0.8)
+# Assumed cost of the LLM routing call until real calls have been timed
+INTENT_LLM_BASELINE_MS = float(os.getenv("INTENT_LLM_BASELINE_MS") or 1500)
+
+# What the LLM router answers for "popular" / "top" queries
+POPULAR_SLUGS = ["cryptopunks", "boredapeyachtclub", "azuki", "doodles-official"]
+POPULAR_WORDS = {"popular", "top", "best", "trending", "biggest", "hottest", "famous"}
+
+# query_type -> keywords, checked in this order; the first hit wins
+QUERY_TYPE_KEYWORDS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("comparison", ("compare", "comparison", "vs", "versus", "difference", "better", "or")),
+    ("price", ("floor", "price", "prices", "cost", "cheap", "cheapest", "expensive", "worth", "eth")),
+    ("stats", ("stats", "statistics", "volume", "owners", "holders", "supply", "sales", "market", "cap", "average")),
+    ("social", ("twitter", "discord", "instagram", "website", "social", "socials", "links", "wiki")),
+    ("history", ("history", "created", "launched", "launch", "founded", "when", "origin", "minted")),
+]
+QUERY_TYPE_INTENTS = {
+    "price": "Get the floor price and pricing",
+    "stats": "Get collection statistics (volume, owners, supply, sales)",
+    "comparison": "Compare prices and statistics",
+    "social": "Get social links and community channels",
+    "history": "Get launch date and collection history",
+    "general": "Get NFT collection information",
+}
+# Fuzzy matching skips words this short or this common; too many false hits
+FUZZY_MIN_LENGTH = 4
+# ...and aliases much longer or shorter than the word: a misspelling keeps
+# roughly its length, while "blocks" vs "artblocks" still scores 0.8
+FUZZY_MAX_LENGTH_DIFF = 2
+STOPWORDS = {
+    "what", "whats", "the", "is", "of", "for", "and", "about", "show", "tell",
+    "me", "give", "get", "how", "much", "many", "does", "with", "nft", "nfts",
+    "collection", "collections", "a", "an", "are", "to", "in", "on", "please",
+    "right", "now", "today", "currently", "some", "which", "who", "should", "i",
+}
+# Words that carry the question, not a name; never fuzzy-matched to an alias
+QUERY_WORDS = {word for _, keywords in QUERY_TYPE_KEYWORDS for word in keywords} | POPULAR_WORDS
+
+CONJUNCTIONS = {"and", "or", "vs", "versus", "with", "against"}
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+@dataclass
+class Route:
+    collections: List[str]
+    user_intent: str
+    query_type: str
+    # exact, fuzzy or popular
+    matched_by: Dict[str, str] = field(default_factory=dict)
+
+
+class IntentRouter:
+    """
+    Local stand-in for the LLM routing call: longest-match over a word trie
+    built from the alias -> slug mapping, difflib for misspellings, and
+    keyword rules for query_type. route() returns None when the query is
+    ambiguous so the caller can ask the LLM instead.
+    """
+
+    def __init__(self, aliases: Dict[str, str], fuzzy_cutoff: float = INTENT_FUZZY_CUTOFF):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        # word -> child node; the "$" key holds the slug an alias ends on
+        self.trie: Dict = {}
+        self.single_words: Dict[str, str] = {}
+        self.display_names: Dict[str, str] = {}
+        for alias, slug in aliases.items():
+            words = tokenize(alias)
+            if not words:
+                continue
+            node = self.trie
+            for word in words:
+                node = node.setdefault(word, {})
+            node["$"] = slug
+            # Joined form catches "boredape" / "pudgypenguins"
+            self.single_words.setdefault("".join(words), slug)
+            self.display_names.setdefault(slug, alias.title())
+        self.vocabulary = list(self.single_words)
+
+        self.routed = 0
+        self.fallbacks = 0
+        self.fuzzy_matches = 0
+        self.route_seconds = 0.0
+        self.llm_calls = 0
+        self.llm_seconds_avg = INTENT_LLM_BASELINE_MS / 1000
+
+    def _match_aliases(self, words: List[str]) -> Tuple[List[str], Dict[str, str], List[int]]:
+        """Slugs in query order, how each matched, and positions no alias covered"""
+        slugs: List[str] = []
+        matched_by: Dict[str, str] = {}
+        leftover: List[int] = []
+        i = 0
+        while i < len(words):
+            node, end, slug = self.trie, i, None
+            for j in range(i, len(words)):
+                node = node.get(words[j])
+                if node is None:
+                    break
+                if "$" in node:
+                    end, slug = j + 1, node["$"]
+            if slug is None:
+                leftover.append(i)
+                i += 1
+                continue
+            if slug not in matched_by:
+                slugs.append(slug)
+                matched_by[slug] = "exact"
+            i = end
+        return slugs, matched_by, leftover
+
+    def _fuzzy(self, word: str) -> Optional[str]:
+        if len(word) < FUZZY_MIN_LENGTH or word in STOPWORDS or word in QUERY_WORDS:
+            return None
+        candidates = [
+            alias for alias in self.vocabulary
+            if abs(len(alias) - len(word)) <= FUZZY_MAX_LENGTH_DIFF
+        ]
+        close = difflib.get_close_matches(word, candidates, n=1, cutoff=self.fuzzy_cutoff)
+        return self.single_words[close[0]] if close else None
+
+    @staticmethod
+    def classify(words: List[str]) -> str:
+        present = set(words)
+        for query_type, keywords in QUERY_TYPE_KEYWORDS:
+            if present.intersection(keywords):
+                return query_type
+        return "general"
+
+    def route(self, query: str) -> Optional[Route]:
+        started = time.perf_counter()
+        route = self._route(query) if INTENT_ROUTER_ENABLED else None
+        self.route_seconds += time.perf_counter() - started
+        if route is None:
+            self.fallbacks += 1
+        else:
+            self.routed += 1
+        return route
+
+    def _route(self, query: str) -> Optional[Route]:
+        words = tokenize(query)
+        if not words:
+            return None
+        slugs, matched_by, leftover = self._match_aliases(words)
+
+        unresolved = set()
+        for i in leftover:
+            slug = self._fuzzy(words[i])
+            if slug is None:
+                unresolved.add(i)
+            elif slug not in matched_by:
+                slugs.append(slug)
+                matched_by[slug] = "fuzzy"
+                self.fuzzy_matches += 1
+
+        # "bayc and milady": the word after a conjunction names a collection
+        # we don't know, so answering for bayc alone would drop half the question
+        for i, word in enumerate(words[:-1]):
+            if word in CONJUNCTIONS and i + 1 in unresolved and words[i + 1] not in STOPWORDS:
+                return None
+
+        query_type = self.classify(words)
+        if not slugs:
+            # "top otherside lands" names something we don't know; only a bare
+            # "top collections" gets the default popular list
+            named = [words[i] for i in unresolved if words[i] not in STOPWORDS | QUERY_WORDS]
+            if POPULAR_WORDS.intersection(words) and not named:
+                slugs = list(POPULAR_SLUGS)
+                matched_by = {slug: "popular" for slug in slugs}
+            else:
+                # Names we don't know ("how is milady doing") are the LLM's job
+                return None
+        # "or" alone is too weak a comparison signal with a single collection
+        if query_type == "comparison" and len(slugs) < 2:
+            return None
+
+        names = ", ".join(self.display_names.get(slug, slug) for slug in slugs)
+        return Route(
+            collections=slugs,
+            user_intent=f"{QUERY_TYPE_INTENTS[query_type]} for {names}",
+            query_type=query_type,
+            matched_by=matched_by,
+        )
+
+    def record_llm(self, seconds: float):
+        """Time of one LLM routing call; feeds the latency-saved estimate"""
+        self.llm_calls += 1
+        # Moving average so the estimate follows the model's current latency
+        self.llm_seconds_avg += (seconds - self.llm_seconds_avg) * 0.2
+
+    def stats(self) -> Dict:
+        total = self.routed + self.fallbacks
+        return {
+            "enabled": INTENT_ROUTER_ENABLED,
+            "aliases": len(self.vocabulary),
+            "queries": total,
+            "routed_locally": self.routed,
+            "llm_fallbacks": self.fallbacks,
+            "hit_rate": round(self.routed / total, 3) if total else None,
+            "fuzzy_matches": self.fuzzy_matches,
+            "avg_route_ms": round(self.route_seconds / total * 1000, 3) if total else None,
+            "llm_calls_timed": self.llm_calls,
+            "llm_route_ms_avg": round(self.llm_seconds_avg * 1000, 1),
+            "latency_saved_ms": round(self.routed * self.llm_seconds_avg * 1000, 1),
+        }
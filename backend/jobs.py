@@ -0,0 +1,197 @@
+import asyncio
+import os
+import time
+import traceback
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+# =========================
+# Config (env-first)
+# =========================
+JOB_WORKERS = int(os.getenv("JOB_WORKERS") or 2)
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE") or 50)
+# Finished jobs stay pollable for this many seconds
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS") or 3600)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind: str, fn: Callable, args: tuple):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.fn = fn
+        self.args = args
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.dedupe_key: Any = None
+        # Set and replaced on every status change so SSE subscribers wake up
+        self.changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        out = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error is not None:
+            out["error"] = self.error
+        if include_result and self.status == DONE:
+            out["result"] = self.result
+        return out
+
+
+class JobQueue:
+    """
+    Bounded queue + fixed worker pool for slow, blocking work (downloads,
+    image edits). Blocking callables run on a dedicated thread pool so the
+    event loop keeps serving other requests.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, max_queue: int = JOB_QUEUE_SIZE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.jobs: Dict[str, Job] = {}
+        # dedupe key -> job still queued or running
+        self._active: Dict[Any, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks = []
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self._wait_times: Deque[float] = deque(maxlen=500)
+        self._run_times: Deque[float] = deque(maxlen=500)
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="job-worker"
+        )
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, kind: str, fn: Callable, *args, dedupe_key: Any = None) -> Job:
+        """
+        Queue fn(*args); raises QueueFull instead of growing without bound.
+        Submitting a dedupe_key that is already queued or running returns
+        that job instead of starting a new one.
+        """
+        self._prune()
+        if dedupe_key is not None:
+            active = self._active.get(dedupe_key)
+            if active is not None and not active.finished:
+                self.deduplicated += 1
+                return active
+        job = Job(kind, fn, args)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull(f"Job queue is full ({self.max_queue} waiting)")
+        self.jobs[job.id] = job
+        if dedupe_key is not None:
+            job.dedupe_key = dedupe_key
+            self._active[dedupe_key] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _set_status(self, job: Job, status: str):
+        job.status = status
+        job.changed.set()
+        job.changed = asyncio.Event()
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.started_at = time.time()
+            self._wait_times.append(job.started_at - job.created_at)
+            self._set_status(job, RUNNING)
+            self.running += 1
+            try:
+                if asyncio.iscoroutinefunction(job.fn):
+                    job.result = await job.fn(*job.args)
+                else:
+                    job.result = await loop.run_in_executor(self._executor, job.fn, *job.args)
+                status = DONE
+                self.completed += 1
+            except Exception as e:
+                print(traceback.format_exc())
+                job.error = str(e)
+                status = FAILED
+                self.failed += 1
+            finally:
+                self.running -= 1
+                job.finished_at = time.time()
+                self._run_times.append(job.finished_at - job.started_at)
+                self._queue.task_done()
+                if job.dedupe_key is not None and self._active.get(job.dedupe_key) is job:
+                    del self._active[job.dedupe_key]
+            self._set_status(job, status)
+
+    async def watch(self, job: Job) -> AsyncIterator[Job]:
+        """Yield the job now and after every status change until it finishes"""
+        while True:
+            changed = job.changed
+            yield job
+            if job.finished:
+                return
+            await changed.wait()
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        for job_id in [j.id for j in self.jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    @staticmethod
+    def _summary(samples) -> Dict:
+        if not samples:
+            return {"count": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+        ordered = sorted(samples)
+        pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+        return {
+            "count": len(ordered),
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+            "p50_ms": pick(0.5),
+            "p95_ms": pick(0.95),
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "deduplicated": self.deduplicated,
+            "queue_wait": self._summary(self._wait_times),
+            "run_time": self._summary(self._run_times),
+        }
@@ -11,11 +11,14 @@ import dotenv
 import os
 
 from fastapi import FastAPI, UploadFile, Form
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, Response
 import os
 import shutil
 # Ensure mint.py exists in the same directory or adjust the import path accordingly
-from NFTminting.mint import mint_image, NFT_IMAGES_DIR
+from NFTminting.mint import mint_image, NFT_IMAGES_DIR, SIGNER
+from NFTminting.image_inbox import ImageInbox
+from NFTminting.mint_ledger import MintLedger
+from sse import read_jsonrpc_events
 
 
 dotenv.load_dotenv()
@@ -34,17 +37,13 @@ class OpenSeaMCPClient:
         self.session_id = None
         self.initialize_and_setup_session()
     
-    def handle_sse_response(self, response):
-        """Handle Server-Sent Events response"""
-        events = []
-        for line in response.iter_lines(decode_unicode=True):
-            if line.startswith('data: '):
-                try:
-                    data = json.loads(line[6:])
-                    events.append(data)
-                except json.JSONDecodeError:
-                    events.append({"raw": line[6:]})
-        return events
+    def handle_sse_response(self, response, request_id=None):
+        """Handle Server-Sent Events response, returning once request_id is answered"""
+        try:
+            return read_jsonrpc_events(response.iter_lines(decode_unicode=True), request_id)
+        finally:
+            # Don't wait for the server to close a stream we no longer need
+            response.close()
     
     def send_request(self, method, params=None, use_session_id=True):
         """Send JSON-RPC request"""
@@ -76,7 +75,7 @@ class OpenSeaMCPClient:
             content_type = response.headers.get('content-type', '')
             
             if 'text/event-stream' in content_type:
-                return self.handle_sse_response(response)
+                return self.handle_sse_response(response, payload["id"])
             else:
                 return response.json()
                 
@@ -154,6 +153,7 @@ class OpenSeaMCPClient:
 
 from fastmcp import FastMCP
 import dotenv
+from response_cache import ResponseCache, make_key
 
 # Load .env
 dotenv.load_dotenv()
@@ -167,8 +167,19 @@ HEADERS = {"X-API-KEY": OPENSEA_MCP_KEY} if OPENSEA_MCP_KEY else {}
 # Initialize MCP server
 mcp = FastMCP("opensea-mcp")
 
+# Floor prices move fast, so they use the short "floor_price" TTL
+response_cache = ResponseCache()
+
 # Tool: fetch floor price for a collection
 def _get_floor_price_raw(collection_slug: str):
+    """Floor price for a collection, cached briefly to spare the API key"""
+    return response_cache.get_or_fetch_sync(
+        "floor_price",
+        make_key("collections/stats", collection_slug),
+        lambda: _fetch_floor_price(collection_slug),
+    )
+
+def _fetch_floor_price(collection_slug: str):
     """Raw function to fetch floor price directly"""
     if not OPENSEA_MCP_KEY:
         return {"error": "Missing OpenSea API key. Set OPENSEA_MCP_KEY in .env"}
@@ -201,26 +212,67 @@ if __name__ == "__main__":
 
 
 
+# Standalone mint endpoint: uvicorn mcp.server:app (the main API's queued
+# /api/mint-nft lives in app.py)
+app = FastAPI()
+
+# One ledger connection and one inbox for the process, opened on the first mint
+_mint_ledger: Optional[MintLedger] = None
+_inbox: Optional[ImageInbox] = None
+
+
+def get_mint_ledger() -> MintLedger:
+    global _mint_ledger
+    if _mint_ledger is None:
+        _mint_ledger = MintLedger()
+    return _mint_ledger
+
+
+def get_inbox() -> ImageInbox:
+    global _inbox
+    if _inbox is None:
+        _inbox = ImageInbox()
+    return _inbox
+
+
 @app.post("/api/mint-nft")
 async def mint_nft(file: UploadFile, brand: str = Form(...)):
+    inbox = get_inbox()
+    save_path = os.path.join(NFT_IMAGES_DIR, os.path.basename(file.filename or "upload.png"))
+    # Claim before writing so the inbox scanner never mints the same file
+    if not inbox.claim(save_path):
+        return JSONResponse({"error": "This file was already minted or is being minted"}, status_code=409)
     try:
-        # Save uploaded file temporarily
-        save_path = os.path.join(NFT_IMAGES_DIR, file.filename)
+        os.makedirs(NFT_IMAGES_DIR, exist_ok=True)
         with open(save_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
 
         # Call mint logic
-        file_path, nft_id, tx_output = mint_image(save_path, name=brand, description=f"Branded NFT {brand}")
-
-        if not nft_id:
-            return JSONResponse({"error": "Minting failed"}, status_code=500)
+        record, meta = mint_image(save_path, name=brand, description=f"Branded NFT {brand}")
+    except Exception as e:
+        inbox.release(save_path)
+        return JSONResponse({"error": str(e)}, status_code=500)
 
-        # Return log file to download
-        return FileResponse(
-            file_path,
-            media_type="text/plain",
-            filename=f"{nft_id}.txt"
+    if record["returncode"] != 0 or record["error"]:
+        inbox.release(save_path)
+        return JSONResponse({"error": record["error"] or "Minting failed"}, status_code=500)
+    if not record["nft_ids"]:
+        # Sealed, so it is on chain; don't let the file be minted again
+        inbox.mark_minted(save_path, None, tx_id=record["tx_id"])
+        return JSONResponse(
+            {"error": f"Tx {record['tx_id']} sealed but its NFT ID could not be parsed"},
+            status_code=500,
         )
-
+    nft_id = record["nft_ids"][0]
+    inbox.mark_minted(save_path, nft_id)
+    try:
+        get_mint_ledger().record(record, [dict(meta, brand=brand, file_path=save_path)], SIGNER)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
\ No newline at end of file
+        print(f"⚠️ Mint ledger write failed for {record['tx_id']}: {e}")
+
+    # Return transaction info to download
+    return Response(
+        json.dumps(record, indent=2),
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="{nft_id}.txt"'},
+    )
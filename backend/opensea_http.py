@@ -0,0 +1,220 @@
+import asyncio
+import importlib.util
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from response_cache import ResponseCache, make_key
+
+# =========================
+# Config (env-first)
+# =========================
+OPENSEA_BASE_URL = os.getenv("OPENSEA_BASE_URL", "https://api.opensea.io/api/v2")
+OPENSEA_MAX_CONNECTIONS = int(os.getenv("OPENSEA_MAX_CONNECTIONS", "100"))
+OPENSEA_MAX_KEEPALIVE = int(os.getenv("OPENSEA_MAX_KEEPALIVE", "20"))
+OPENSEA_KEEPALIVE_EXPIRY = float(os.getenv("OPENSEA_KEEPALIVE_EXPIRY", "30"))
+OPENSEA_PER_HOST_LIMIT = int(os.getenv("OPENSEA_PER_HOST_LIMIT", "16"))
+OPENSEA_TIMEOUT = float(os.getenv("OPENSEA_TIMEOUT", "20"))
+
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+OPENSEA_HTTP2 = os.getenv("OPENSEA_HTTP2", "1") == "1" and HTTP2_AVAILABLE
+
+
+class OpenSeaHTTPClient:
+    """Long-lived pooled client shared by every OpenSea route"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str = OPENSEA_BASE_URL,
+        max_connections: int = OPENSEA_MAX_CONNECTIONS,
+        max_keepalive: int = OPENSEA_MAX_KEEPALIVE,
+        keepalive_expiry: float = OPENSEA_KEEPALIVE_EXPIRY,
+        per_host_limit: int = OPENSEA_PER_HOST_LIMIT,
+        timeout: float = OPENSEA_TIMEOUT,
+        http2: bool = OPENSEA_HTTP2,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.per_host_limit = per_host_limit
+        self.cache = cache
+        self.http2 = http2
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"accept": "application/json", "x-api-key": api_key or ""},
+            limits=self.limits,
+            timeout=timeout,
+            http2=http2,
+        )
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Counted here rather than read from httpx's private pool internals
+        self._waiting: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._peak_in_flight: Dict[str, int] = {}
+        self.active_requests = 0
+        self.peak_active_requests = 0
+        self.total_requests = 0
+        self.total_errors = 0
+        self.total_latency = 0.0
+        self._calls: Dict[Tuple, asyncio.Task] = {}
+        self.flight_leaders = 0
+        self.flight_coalesced = 0
+
+    def _host_of(self, url: str) -> str:
+        host = urlsplit(url).netloc
+        return host or self.client.base_url.host
+
+    def _semaphore_for(self, host: str) -> asyncio.Semaphore:
+        sem = self._host_semaphores.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = sem
+        return sem
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the shared pool, capped per upstream host"""
+        host = self._host_of(url)
+        sem = self._semaphore_for(host)
+        self._waiting[host] = self._waiting.get(host, 0) + 1
+        try:
+            await sem.acquire()
+        finally:
+            self._waiting[host] -= 1
+
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        self._peak_in_flight[host] = max(self._peak_in_flight.get(host, 0), self._in_flight[host])
+        self.active_requests += 1
+        self.peak_active_requests = max(self.peak_active_requests, self.active_requests)
+        started = time.perf_counter()
+        try:
+            return await self.client.get(url, **kwargs)
+        except httpx.HTTPError:
+            self.total_errors += 1
+            raise
+        finally:
+            self._in_flight[host] -= 1
+            self.active_requests -= 1
+            self.total_requests += 1
+            self.total_latency += time.perf_counter() - started
+            sem.release()
+
+    async def _fetch_json(self, url: str, params: Optional[Dict]) -> Any:
+        res = await self.get(url, params=params)
+        if not res.is_success:
+            # A 429/5xx body is not data: hand back an error marker the cache refuses
+            try:
+                body = res.json()
+            except ValueError:
+                body = res.text[:500]
+            return {"error": f"OpenSea returned {res.status_code}", "status": res.status_code, "detail": body}
+        return res.json()
+
+    async def get_json(
+        self, url: str, params: Optional[Dict] = None, resource: Optional[str] = None
+    ) -> Any:
+        """
+        GET and decode JSON, coalescing identical in-flight requests (single-flight).
+        Concurrent callers share one upstream call and receive the same object,
+        so treat the result as read-only. Passing `resource` reads through the
+        response cache with that resource's TTLs.
+        """
+        if resource and self.cache is not None:
+            return await self.cache.get_or_fetch(
+                resource,
+                make_key(url, **(params or {})),
+                lambda: self._single_flight(url, params),
+            )
+        return await self._single_flight(url, params)
+
+    async def _single_flight(self, url: str, params: Optional[Dict]) -> Any:
+        key = (url, tuple(sorted((params or {}).items())))
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_json(url, params))
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.flight_leaders += 1
+        else:
+            self.flight_coalesced += 1
+        # shield: one cancelled viewer must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    async def iter_pages(
+        self, url: str, params: Optional[Dict] = None, page_size: int = 200
+    ) -> AsyncIterator[Dict]:
+        """
+        Follow OpenSea `next` cursors page by page. The next page is requested as
+        soon as the current one arrives, so it downloads while the caller is still
+        consuming the current page. Only two pages are ever held at once.
+        """
+        params = dict(params or {}, limit=page_size)
+        pending = asyncio.ensure_future(self._fetch_json(url, params))
+        try:
+            while pending is not None:
+                page = await pending
+                cursor = page.get("next") if isinstance(page, dict) else None
+                pending = (
+                    asyncio.ensure_future(self._fetch_json(url, dict(params, next=cursor)))
+                    if cursor
+                    else None
+                )
+                yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def pool_stats(self) -> Dict:
+        """Snapshot of pool limits and per-host utilisation"""
+        return {
+            "http2": self.http2,
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+                "per_host_limit": self.per_host_limit,
+            },
+            # Requests on the wire; with HTTP/2 several can share a connection
+            "connections": {
+                "active": self.active_requests,
+                "peak_active": self.peak_active_requests,
+                "utilisation": (
+                    self.active_requests / self.limits.max_connections
+                    if self.limits.max_connections
+                    else 0.0
+                ),
+            },
+            "hosts": {
+                host: {
+                    "in_flight": self._in_flight.get(host, 0),
+                    "waiting": self._waiting.get(host, 0),
+                    "peak_in_flight": self._peak_in_flight.get(host, 0),
+                    "available_slots": self.per_host_limit - self._in_flight.get(host, 0),
+                }
+                for host in self._host_semaphores
+            },
+            "requests": {
+                "total": self.total_requests,
+                "errors": self.total_errors,
+                "avg_latency_ms": (
+                    round(self.total_latency / self.total_requests * 1000, 2)
+                    if self.total_requests
+                    else 0.0
+                ),
+            },
+            "single_flight": {
+                "in_flight": len(self._calls),
+                "upstream_calls": self.flight_leaders,
+                "coalesced": self.flight_coalesced,
+            },
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
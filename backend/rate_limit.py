@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, bursts up to `capacity`.
+    Callers await acquire() instead of sleeping a fixed interval, so
+    independent requests can run concurrently until the budget runs out.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.waits = 0
+        self.waited_seconds = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, tokens: float = 1.0):
+        # The lock makes waiters queue up in arrival order
+        async with self._lock:
+            self._refill()
+            if self.tokens < tokens:
+                delay = (tokens - self.tokens) / self.rate
+                self.waits += 1
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self.tokens -= tokens
+
+    def stats(self):
+        return {
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "waits": self.waits,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
@@ -0,0 +1,312 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# =========================
+# Config (env-first)
+# =========================
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES") or 64 * 1024 * 1024)
+# Empty disables the on-disk tier
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH") or ""
+
+# resource -> (fresh seconds, extra seconds a stale value may still be served
+# while it is revalidated in the background)
+RESOURCE_TTLS: Dict[str, Tuple[float, float]] = {
+    "account": (3600, 86400),
+    "collection": (600, 3600),
+    "nfts": (300, 1800),
+    "floor_price": (30, 120),
+    # Flow collections change with every mint; minted metadata never does
+    "flow_ids": (30, 300),
+    "flow_nft": (86400, 7 * 86400),
+}
+DEFAULT_TTL: Tuple[float, float] = (60, 300)
+
+
+def make_key(endpoint: str, *args, **kwargs) -> str:
+    """Stable cache key from an endpoint plus its arguments"""
+    return json.dumps([endpoint, args, sorted(kwargs.items())], default=str)
+
+
+def is_error_message(message: Any) -> bool:
+    """
+    Error payloads: ours use "error", OpenSea's use "errors" (or "detail" when
+    throttled), JSON-RPC replies carry "error" and failed MCP tool calls set
+    result.isError
+    """
+    if not isinstance(message, dict):
+        return False
+    if message.get("error") or message.get("errors") or message.get("detail"):
+        return True
+    result = message.get("result")
+    return isinstance(result, dict) and bool(result.get("isError"))
+
+
+def is_cacheable(value: Any) -> bool:
+    """Never cache errors, including MCP replies (event lists) with an error event in them"""
+    if value is None:
+        return False
+    if isinstance(value, list):
+        return not any(is_error_message(message) for message in value)
+    return not is_error_message(value)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+    size: int
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_usable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+class LRUCache:
+    """In-process tier: LRU ordered, evicts by total serialized bytes"""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if not entry.is_usable(time.time()):
+                self._drop(key)
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = entry
+            self.current_bytes += entry.size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key: str):
+        entry = self._data.pop(key)
+        self.current_bytes -= entry.size
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class SQLiteCache:
+    """Optional on-disk tier so warm data survives restarts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " fresh_until REAL NOT NULL, stale_until REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fresh_until, stale_until FROM cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[2] <= time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return CacheEntry(json.loads(row[0]), row[1], row[2], len(row[0]))
+
+    def set(self, key: str, entry: CacheEntry, serialized: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (key, serialized, entry.fresh_until, entry.stale_until),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        return {"path": self.path, "entries": count}
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU + optional SQLite) TTL cache with stale-while-revalidate.
+    Fresh hits return immediately; stale-but-usable hits return immediately and
+    trigger one background refresh; misses call through.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_MAX_BYTES,
+        sqlite_path: Optional[str] = CACHE_SQLITE_PATH or None,
+        ttls: Optional[Dict[str, Tuple[float, float]]] = None,
+        memory: Optional[LRUCache] = None,
+        disk: Optional[SQLiteCache] = None,
+    ):
+        self.memory = memory or LRUCache(max_bytes)
+        self.disk = disk or (SQLiteCache(sqlite_path) if sqlite_path else None)
+        self.ttls = dict(RESOURCE_TTLS, **(ttls or {}))
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        # key -> task fetching it, so concurrent misses share one upstream call
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background: List[asyncio.Task] = []
+
+    def _count(self, resource: str, what: str):
+        bucket = self.counters.setdefault(
+            resource,
+            {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0},
+        )
+        bucket[what] += 1
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    def set(self, resource: str, key: str, value: Any):
+        if not is_cacheable(value):
+            return
+        fresh, stale = self.ttls.get(resource, DEFAULT_TTL)
+        serialized = json.dumps(value, default=str)
+        now = time.time()
+        entry = CacheEntry(value, now + fresh, now + fresh + stale, len(serialized))
+        self.memory.set(key, entry)
+        if self.disk is not None:
+            self.disk.set(key, entry, serialized)
+
+    def _claim_refresh(self, key: str) -> bool:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _release_refresh(self, key: str):
+        with self._refresh_lock:
+            self._refreshing.discard(key)
+
+    async def get_or_fetch(
+        self, resource: str, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Async read-through with stale-while-revalidate"""
+        entry = self.get(key)
+        now = time.time()
+        if entry is not None and entry.is_fresh(now):
+            self._count(resource, "hits")
+            return entry.value
+        if entry is not None:
+            self._count(resource, "stale_hits")
+            if self._claim_refresh(key):
+                task = asyncio.ensure_future(self._refresh(resource, key, fetch))
+                self._background.append(task)
+                task.add_done_callback(self._background.remove)
+            return entry.value
+
+        task = self._inflight.get(key)
+        if task is None:
+            self._count(resource, "misses")
+            task = asyncio.ensure_future(self._fetch_and_set(resource, key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self._count(resource, "coalesced")
+        # shield: one cancelled caller must not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_and_set(self, resource: str, key: str, fetch) -> Any:
+        value = await fetch()
+        self.set(resource, key, value)
+        return value
+
+    async def _refresh(self, resource: str, key: str, fetch):
+        try:
+            self.set(resource, key, await fetch())
+            self._count(resource, "refreshes")
+        except Exception as e:
+            print(f"⚠️ Cache refresh failed for {key}: {e}")
+        finally:
+            self._release_refresh(key)
+
+    def get_or_fetch_sync(self, resource: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """Blocking read-through; stale values are refreshed on a daemon thread"""
+        entry = self.get(key)
+        now = time.time()
+        if entry is not None and entry.is_fresh(now):
+            self._count(resource, "hits")
+            return entry.value
+        if entry is not None:
+            self._count(resource, "stale_hits")
+            if self._claim_refresh(key):
+                threading.Thread(
+                    target=self._refresh_sync, args=(resource, key, fetch), daemon=True
+                ).start()
+            return entry.value
+
+        self._count(resource, "misses")
+        value = fetch()
+        self.set(resource, key, value)
+        return value
+
+    def _refresh_sync(self, resource: str, key: str, fetch):
+        try:
+            self.set(resource, key, fetch())
+            self._count(resource, "refreshes")
+        except Exception as e:
+            print(f"⚠️ Cache refresh failed for {key}: {e}")
+        finally:
+            self._release_refresh(key)
+
+    def stats(self) -> Dict:
+        totals = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0}
+        for bucket in self.counters.values():
+            for k, v in bucket.items():
+                totals[k] += v
+        lookups = totals["hits"] + totals["stale_hits"] + totals["misses"] + totals["coalesced"]
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+            "totals": totals,
+            "hit_ratio": (
+                round((totals["hits"] + totals["stale_hits"]) / lookups, 4)
+                if lookups
+                else 0.0
+            ),
+            "by_resource": self.counters,
+        }
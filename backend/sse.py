@@ -0,0 +1,131 @@
+import json
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+
+@dataclass
+class SSEEvent:
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+
+
+class SSEParser:
+    """
+    Line-at-a-time Server-Sent Events parser (WHATWG rules): consecutive
+    `data:` lines are joined with newlines, a blank line dispatches the
+    event, `:` lines are comments.
+    """
+
+    def __init__(self):
+        self._data: List[str] = []
+        self._event = ""
+        self._id: Optional[str] = None
+        self.last_event_id: Optional[str] = None
+
+    def feed(self, line: str) -> Optional[SSEEvent]:
+        """Consume one line (without its terminator); returns an event when one completes"""
+        if not line:
+            return self.flush()
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id" and "\0" not in value:
+            self._id = value
+        return None
+
+    def flush(self) -> Optional[SSEEvent]:
+        """Dispatch whatever is buffered (blank line, or end of stream)"""
+        if self._id is not None:
+            self.last_event_id = self._id
+        if not self._data:
+            self._event, self._id = "", None
+            return None
+        event = SSEEvent("\n".join(self._data), self._event or "message", self.last_event_id)
+        self._data, self._event, self._id = [], "", None
+        return event
+
+
+def iter_events(lines: Iterable[str]) -> Iterator[SSEEvent]:
+    parser = SSEParser()
+    for line in lines:
+        event = parser.feed(line.rstrip("\r"))
+        if event is not None:
+            yield event
+    # Servers that close without a trailing blank line still get their last event out
+    event = parser.flush()
+    if event is not None:
+        yield event
+
+
+async def aiter_events(lines: AsyncIterable[str]) -> AsyncIterator[SSEEvent]:
+    parser = SSEParser()
+    async for line in lines:
+        event = parser.feed(line.rstrip("\r"))
+        if event is not None:
+            yield event
+    event = parser.flush()
+    if event is not None:
+        yield event
+
+
+def format_event(data: Any, event: Optional[str] = None, id: Optional[str] = None) -> str:
+    """One SSE frame; data is JSON-encoded (so it never spans lines)"""
+    frame = ""
+    if event:
+        frame += f"event: {event}\n"
+    if id is not None:
+        frame += f"id: {id}\n"
+    return frame + f"data: {json.dumps(data, default=str)}\n\n"
+
+
+def decode_data(data: str) -> Any:
+    try:
+        return json.loads(data)
+    except json.JSONDecodeError:
+        return {"raw": data}
+
+
+def is_response_to(message: Any, request_id: Any) -> bool:
+    """True for the JSON-RPC result/error answering request_id (single or batch)"""
+    if isinstance(message, list):
+        return any(is_response_to(m, request_id) for m in message)
+    return (
+        isinstance(message, dict)
+        and message.get("id") == request_id
+        and ("result" in message or "error" in message)
+    )
+
+
+def read_jsonrpc_events(lines: Iterable[str], request_id: Any = None) -> List[Any]:
+    """
+    Decoded messages up to and including the response to request_id; stops
+    reading there instead of waiting for the server to close the stream.
+    Without a request_id the whole stream is read.
+    """
+    messages = []
+    for event in iter_events(lines):
+        message = decode_data(event.data)
+        messages.append(message)
+        if request_id is not None and is_response_to(message, request_id):
+            break
+    return messages
+
+
+async def aread_jsonrpc_events(lines: AsyncIterable[str], request_id: Any = None) -> List[Any]:
+    """Async twin of read_jsonrpc_events"""
+    messages = []
+    async with aclosing(aiter_events(lines)) as events:
+        async for event in events:
+            message = decode_data(event.data)
+            messages.append(message)
+            if request_id is not None and is_response_to(message, request_id):
+                break
+    return messages
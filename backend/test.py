@@ -1,8 +1,11 @@
 import base64
+import io
+from functools import lru_cache
 from openai import OpenAI
 from dotenv import load_dotenv
 from PIL import Image
 import os
+from image_prep import prepare_source
 
 os.environ.pop("HTTP_PROXY", None)
 os.environ.pop("HTTPS_PROXY", None)
@@ -17,48 +20,61 @@ if not api_key:
 
 client = OpenAI(api_key=api_key)
 
-def edit_image(image_path: str, brand_name: str, output_path: str = "edited_image.png"):
-    """
-    Convert image to RGBA, create a mask, and edit the image via OpenAI.
-    """
-    # Open original image
-    img = Image.open(image_path).convert("RGBA")  # Convert to RGBA
-
-    # Save RGBA temporary image
-    temp_rgba_path = image_path.replace(".png", "_rgba.png")
-    img.save(temp_rgba_path)
+# Bump whenever build_prompt or the source preprocessing changes so cached
+# edits are not reused
+PROMPT_VERSION = "2"
 
-    # Create fully opaque mask (255 = keep everything)
-    mask = Image.new("L", img.size, 255)  
-    mask_path = image_path.replace(".png", "_mask.png")
-    mask.save(mask_path)
 
-    prompt = (
+def build_prompt(brand_name: str) -> str:
+    return (
         f"Take this image and create a promotional version featuring the brand '{brand_name}'. "
         "Retain the original art style, colors, and composition, but integrate the brand naturally. "
         "The character in the original image should be using the product '{brand_name}'."
         "The correct use is important, and not like only merchandise."
     )
 
+
+@lru_cache(maxsize=8)
+def _opaque_mask_png(size: tuple) -> bytes:
+    """Fully opaque mask (255 = keep everything), encoded once per image size"""
+    buf = io.BytesIO()
+    Image.new("L", size, 255).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def edit_image_bytes(image_bytes: bytes, brand_name: str) -> bytes:
+    """
+    In-memory edit: normalize/downsample the source, upload it with the cached
+    mask and return the edited PNG bytes. Nothing touches the disk.
+    """
+    source_png, size = prepare_source(image_bytes)
+    mask_png = _opaque_mask_png(size)
+
+    prompt = build_prompt(brand_name)
+
     print("Sending edit request to OpenAI...")
-    with open(temp_rgba_path, "rb") as img_file, open(mask_path, "rb") as mask_file:
-        response = client.images.edit(
-            model="gpt-image-1",
-            image=img_file,
-            mask=mask_file,
-            prompt=prompt,
-            size="1024x1024",
-            timeout=600
-        )
+    response = client.images.edit(
+        model="gpt-image-1",
+        image=("image.png", source_png, "image/png"),
+        mask=("mask.png", mask_png, "image/png"),
+        prompt=prompt,
+        size="1024x1024",
+        timeout=600
+    )
 
     # Decode returned image
-    image_base64 = response.data[0].b64_json
-    image_bytes = base64.b64decode(image_base64)
+    return base64.b64decode(response.data[0].b64_json)
+
+
+def edit_image(image_path: str, brand_name: str, output_path: str = "edited_image.png"):
+    """
+    Convert image to RGBA, create a mask, and edit the image via OpenAI.
+    File-based wrapper around edit_image_bytes.
+    """
+    with open(image_path, "rb") as f:
+        image_bytes = edit_image_bytes(f.read(), brand_name)
+
     with open(output_path, "wb") as f:
         f.write(image_bytes)
 
-    # Clean up temp files
-    os.remove(temp_rgba_path)
-    os.remove(mask_path)
-
     print(f"Edited image saved to {output_path}")
@@ -86,6 +86,30 @@ export default function CollectionViewer({ collectionName, nfts, walletAddress }
     }
   };
 
+  // /api/edit-nft queues a job; poll it until the edited image is ready
+  const waitForJob = async (jobId: string) => {
+    while (true) {
+      const res = await fetch(`http://127.0.0.1:8000/api/jobs/${jobId}`);
+      const job = await res.json();
+      if (job.status === "done") {
+        const result = await fetch(`http://127.0.0.1:8000${job.result_url}`);
+        return result.json();
+      }
+      if (job.status === "failed" || job.error) return { error: job.error || "Edit failed" };
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+    }
+  };
+
+  const waitForMint = async (statusUrl: string) => {
+    while (true) {
+      const res = await fetch(`http://127.0.0.1:8000${statusUrl}`);
+      const job = await res.json();
+      if (job.status === "done") return job.result;
+      if (job.status === "failed" || job.error) return { error: job.error || "Mint failed" };
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+    }
+  };
+
 const handleEditNFT = async () => {
     if (!selected || !brandName) return alert("Select an NFT and enter a brand");
 
@@ -107,7 +131,8 @@ const handleEditNFT = async () => {
         body: formData,
       });
 
-      const data = await res.json();
+      const submitted = await res.json();
+      const data = submitted.job_id ? await waitForJob(submitted.job_id) : submitted;
 
       if (data.error) {
         alert(data.error);
@@ -229,8 +254,12 @@ const handleEditNFT = async () => {
                             body: formData,
                           });
 
-                          if (res.ok) {
-                            const data = await res.json();
+                          const submitted = await res.json();
+                          const data = res.ok && submitted.status_url
+                            ? await waitForMint(submitted.status_url)
+                            : submitted;
+
+                          if (res.ok && !data.error) {
                             const textContent = JSON.stringify(data, null, 2);
                             const blob = new Blob([textContent], { type: "text/plain" });
                             const url = window.URL.createObjectURL(blob);
@@ -248,8 +277,7 @@ const handleEditNFT = async () => {
                               alert("NFT Minted & Saved Locally!");
                             }
                           } else {
-                            const err = await res.json();
-                            alert("Error: " + err.error);
+                            alert("Error: " + data.error);
                           }
                         }}
                         className="mt-2 bg-accent text-white px-4 py-2 rounded-lg hover:bg-purple-500 transition"
@@ -17,6 +17,7 @@ export default function RecommendationViewer({ brandName, onClose }: Props) {
   const [loading, setLoading] = useState(false);
   const [recommendations, setRecommendations] = useState<string[]>([]);
   const [rationale, setRationale] = useState("");
+  const [status, setStatus] = useState("");
 
   const handleSend = async () => {
     if (!input.trim()) return;
@@ -26,23 +27,55 @@ export default function RecommendationViewer({ brandName, onClose }: Props) {
     setInput("");
     setLoading(true);
 
+    // Streamed answer: status events update the banner, tokens grow the last message
+    let placed = false;
+    let answer = "";
+    const setAnswer = (text: string) => {
+      const keep = placed;
+      placed = true;
+      setChatHistory((prev) => [
+        ...(keep ? prev.slice(0, -1) : prev),
+        { sender: "assistant", text },
+      ]);
+    };
+
     try {
-      const res = await fetch("http://localhost:8002/chat", {
+      const res = await fetch("http://localhost:8002/chat/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ query: input }),
       });
-
-      const data = await res.json();
-      const botMessage: ChatMessage = {
-        sender: "assistant",
-        text: data.answer || "No response",
-      };
-      setChatHistory((prev) => [...prev, botMessage]);
+      if (!res.body) throw new Error("No response body");
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const frames = buffer.split("\n\n");
+        buffer = frames.pop() || "";
+        for (const frame of frames) {
+          const event = frame.match(/^event: (.*)$/m)?.[1] || "message";
+          const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] || "{}");
+          if (event === "status" && data.message) {
+            setStatus(data.message);
+          } else if (event === "token") {
+            answer += data.delta;
+            setAnswer(answer);
+          } else if (event === "done") {
+            setAnswer(data.answer || answer || "No response");
+          } else if (event === "error") {
+            setAnswer(data.error);
+          }
+        }
+      }
     } catch (err) {
       console.error("Chat error:", err);
     } finally {
       setLoading(false);
+      setStatus("");
     }
   };
 
@@ -118,7 +151,7 @@ return (
         {/* Loading */}
         {loading && (
           <div className="px-6 py-3 bg-[#1a1d28] border-b border-[#2a2e3a] text-center">
-            <p className="text-text-muted text-sm animate-pulse">Loading recommendations...</p>
+            <p className="text-text-muted text-sm animate-pulse">{status || "Loading recommendations..."}</p>
           </div>
         )}
 